@@ -94,7 +94,7 @@ def create_requirements_if_missing():
         print("📝 Creating requirements.txt...")
         
         requirements = [
-            "streamlit>=1.28.0",
+            "streamlit>=1.37.0",
             "pandas>=1.5.0",
             "numpy>=1.21.0", 
             "plotly>=5.0.0",
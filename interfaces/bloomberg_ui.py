@@ -5,14 +5,16 @@ Combines all trading system components into one cohesive web application
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+import html
 import json
 import time
 import sys
 import os
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -21,24 +23,16 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
 DEBUG = os.getenv('DEBUG', 'true').lower() == 'true'
 
-# Optional imports with graceful fallback
-try:
-    from streamlit_option_menu import option_menu
-    OPTION_MENU_AVAILABLE = True
-except ImportError:
-    OPTION_MENU_AVAILABLE = False
+# Optional packages are only probed here and imported where they are used
+OPTION_MENU_AVAILABLE = find_spec('streamlit_option_menu') is not None
+ACE_AVAILABLE = find_spec('streamlit_ace') is not None
+YFINANCE_AVAILABLE = find_spec('yfinance') is not None
+RESAMPLER_AVAILABLE = find_spec('plotly_resampler') is not None
+KEYRING_AVAILABLE = find_spec('keyring') is not None
 
-try:
-    from streamlit_ace import st_ace
-    ACE_AVAILABLE = True
-except ImportError:
-    ACE_AVAILABLE = False
-
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
+# Keyring service name and the API keys stored under it (widget key -> env var fallback)
+KEYRING_SERVICE = 'trading_terminal'
+API_KEY_ENV = {'av_key': 'ALPHA_VANTAGE_KEY', 'fred_key': 'FRED_API_KEY'}
 
 # Import trading system components with error handling
 TRADING_SYSTEM_AVAILABLE = True
@@ -68,9 +62,8 @@ BLOOMBERG_COLORS = {
     'accent_yellow': '#ffcc00'
 }
 
-def apply_bloomberg_theme():
-    """Apply Bloomberg Terminal styling"""
-    st.markdown(f"""
+# Theme stylesheet, formatted once at import
+_THEME_CSS = f"""
     <style>
     .stApp {{
         background-color: {BLOOMBERG_COLORS['bg_primary']};
@@ -115,6 +108,12 @@ def apply_bloomberg_theme():
         margin: 5px 0;
     }}
 
+    .ict-grid-4 {{
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 10px;
+    }}
+
     .terminal-header {{
         background-color: {BLOOMBERG_COLORS['accent_orange']};
         color: {BLOOMBERG_COLORS['bg_primary']};
@@ -145,6 +144,23 @@ def apply_bloomberg_theme():
         color: {BLOOMBERG_COLORS['text_primary']};
     }}
 
+    .search-results {{
+        width: 100%;
+        border-collapse: collapse;
+        background-color: {BLOOMBERG_COLORS['bg_secondary']};
+        color: {BLOOMBERG_COLORS['text_primary']};
+    }}
+
+    .search-results td {{
+        padding: 6px 10px;
+        border: none;
+        border-bottom: 1px solid {BLOOMBERG_COLORS['bg_tertiary']};
+    }}
+
+    .search-results tr:hover td {{
+        background-color: {BLOOMBERG_COLORS['bg_tertiary']};
+    }}
+
     .sidebar .sidebar-content {{
         background-color: {BLOOMBERG_COLORS['bg_secondary']};
     }}
@@ -164,57 +180,136 @@ def apply_bloomberg_theme():
         color: {BLOOMBERG_COLORS['bg_primary']};
     }}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+def apply_bloomberg_theme():
+    """Apply Bloomberg Terminal styling"""
+    st.markdown(_THEME_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def _get_market_api():
+    """Market data API shared by all sessions"""
+    from trading_core.market_data_api import MarketDataAPI
+    return MarketDataAPI()
+
+def _new_trading_system(capital, strategy_name):
+    """Trading system for one session; it holds positions and capital, so it lives in st.session_state and is never shared"""
+    return TradingSystem(initial_capital=capital, strategy_name=strategy_name)
+
+@st.cache_resource(max_entries=16)
+def _get_ict_strategy(params):
+    """ICT strategy instance per configuration, shared by all sessions"""
+    from ict_strategy.standalone_ict_strategy import StandaloneICTStrategy
+    return StandaloneICTStrategy(dict(params))
+
+def load_api_keys():
+    """API keys from the OS keyring, falling back to environment variables; server side only, never widget values"""
+    keys = {name: os.getenv(env, '') for name, env in API_KEY_ENV.items()}
+    if KEYRING_AVAILABLE:
+        import keyring
+        for name in keys:
+            try:
+                keys[name] = keyring.get_password(KEYRING_SERVICE, name) or keys[name]
+            except Exception:
+                pass
+    return keys
+
+def api_key_status():
+    """Which API keys the server has configured, without exposing the values to the page"""
+    return {name: bool(value) for name, value in load_api_keys().items()}
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'trading_system' not in st.session_state:
-        st.session_state.trading_system = None
-    if 'backtest_results' not in st.session_state:
-        st.session_state.backtest_results = None
-    if 'live_data' not in st.session_state:
-        st.session_state.live_data = {}
-    if 'strategy_code' not in st.session_state:
-        # Load default strategy code
-        try:
-            with open('strategy_framework.py', 'r') as f:
-                st.session_state.strategy_code = f.read()
-        except:
-            st.session_state.strategy_code = "# Strategy code will appear here"
+    if st.session_state.get('_initialized'):
+        return
+
+    defaults = {
+        'trading_system': None,
+        'backtest_results': None,
+        'live_data': {},
+        'watchlist': ['SPY', 'QQQ', 'ES', 'NQ', 'EURUSD', 'GBPUSD'],
+        'search_results': None,
+        'quick_quotes': None,
+        'watchlist_quotes': None,
+        'selected_symbol': None
+    }
+    for key, value in defaults.items():
+        st.session_state.setdefault(key, value)
+
     if 'market_api' not in st.session_state:
         if TRADING_SYSTEM_AVAILABLE:
             try:
-                from trading_core.market_data_api import MarketDataAPI
-                st.session_state.market_api = MarketDataAPI()
+                st.session_state.market_api = _get_market_api()
             except Exception:
                 st.session_state.market_api = None
         else:
             st.session_state.market_api = None
-    if 'watchlist' not in st.session_state:
-        st.session_state.watchlist = ['SPY', 'QQQ', 'ES', 'NQ', 'EURUSD', 'GBPUSD']
 
-def create_terminal_header():
-    """Create unified terminal header"""
-    st.markdown(f"""
+    st.session_state._initialized = True
+
+_HEADER_TMPL = """
     <div class="terminal-header">
-        UNIFIED TRADING TERMINAL v2.0 | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} EST
+        UNIFIED TRADING TERMINAL v2.0 | {now:%Y-%m-%d %H:%M:%S} EST
     </div>
-    """, unsafe_allow_html=True)
+    """
 
-def create_metric_card(title, value, delta=None, delta_color="normal"):
-    """Create Bloomberg-style metric card"""
+@st.fragment(run_every="1s")
+def create_terminal_header():
+    """Create unified terminal header; the clock ticks without rerunning the page"""
+    st.markdown(_HEADER_TMPL.format(now=datetime.now()), unsafe_allow_html=True)
+
+# Status badge templates for values that change between reruns
+_STATUS_HTML = {color: f'<div class="status-{color}">{{}}</div>' for color in ('green', 'red', 'yellow')}
+
+# Theme colors looked up by risk level and by sign of a change
+_RISK_COLOR = {
+    'low': BLOOMBERG_COLORS['accent_green'],
+    'medium': BLOOMBERG_COLORS['accent_yellow'],
+    'high': BLOOMBERG_COLORS['accent_red']
+}
+_POS_STYLE = f"color: {BLOOMBERG_COLORS['accent_green']}"
+_NEG_STYLE = f"color: {BLOOMBERG_COLORS['accent_red']}"
+
+# PO3 zone -> (emoji, market bias)
+_ZONE_STYLE = {
+    'DISCOUNT': ("🟢", "BULLISH BIAS"),
+    'PREMIUM': ("🔴", "BEARISH BIAS")
+}
+
+@lru_cache(maxsize=64)
+def _badge(color, text):
+    """Status badge HTML, memoized per color/label"""
+    return _STATUS_HTML[color].format(text)
+
+# Metric card markup, built once; theme colors are baked in at import
+# (kept on one line so several cards can be joined into a single HTML block)
+_CARD_TMPL = (
+    '<div class="metric-card">'
+    f'<div style="font-size: 14px; color: {BLOOMBERG_COLORS["text_secondary"]};">{{title}}</div>'
+    f'<div style="font-size: 24px; font-weight: bold; color: {BLOOMBERG_COLORS["text_primary"]};">{{value}}</div>'
+    '{delta_html}'
+    '</div>'
+).format
+
+_DELTA_CLASS = {'pos': 'status-green', 'neg': 'status-red', 'neu': 'status-yellow'}
+
+def metric_card_html(title, value, delta=None, delta_color="normal"):
+    """Bloomberg-style metric card markup"""
     delta_html = ""
     if delta is not None:
-        color_class = "status-green" if delta_color == "normal" and delta > 0 else "status-red" if delta < 0 else "status-yellow"
-        delta_html = f'<div class="{color_class}">Δ {delta:+.2f}</div>'
-
-    st.markdown(f"""
-    <div class="metric-card">
-        <div style="font-size: 14px; color: {BLOOMBERG_COLORS['text_secondary']};">{title}</div>
-        <div style="font-size: 24px; font-weight: bold; color: {BLOOMBERG_COLORS['text_primary']};">{value}</div>
-        {delta_html}
-    </div>
-    """, unsafe_allow_html=True)
+        k = 'pos' if delta_color == "normal" and delta > 0 else 'neg' if delta < 0 else 'neu'
+        delta_html = f'<div class="{_DELTA_CLASS[k]}">Δ {delta:+.2f}</div>'
+
+    return _CARD_TMPL(title=title, value=value, delta_html=delta_html)
+
+def create_metric_card(title, value, delta=None, delta_color="normal"):
+    """Create Bloomberg-style metric card"""
+    st.markdown(metric_card_html(title, value, delta, delta_color), unsafe_allow_html=True)
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _portfolio_summary(system_id, _system):
+    """Portfolio summary, cached briefly so click bursts don't rebuild the report"""
+    return _system.get_performance_report()['portfolio_summary']
 
 def dashboard_page():
     """Main dashboard page with fallback for missing components"""
@@ -244,13 +339,13 @@ def dashboard_page():
         col1, col2 = st.columns(2)
 
         with col1:
-            st.markdown('<div class="status-green">Demo Mode: ACTIVE</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-green">Paper Trading: ENABLED</div>', unsafe_allow_html=True)
+            st.markdown(_badge('green', 'Demo Mode: ACTIVE'), unsafe_allow_html=True)
+            st.markdown(_badge('green', 'Paper Trading: ENABLED'), unsafe_allow_html=True)
 
         with col2:
             yf_status = "CONNECTED" if YFINANCE_AVAILABLE else "OFFLINE"
-            st.markdown(f'<div class="status-green">Data Feed: {yf_status}</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-green">Risk Manager: SIMULATED</div>', unsafe_allow_html=True)
+            st.markdown(_badge('green', f'Data Feed: {yf_status}'), unsafe_allow_html=True)
+            st.markdown(_badge('green', 'Risk Manager: SIMULATED'), unsafe_allow_html=True)
 
         return
 
@@ -259,22 +354,28 @@ def dashboard_page():
     if st.session_state.trading_system is None:
         with st.spinner("Initializing Trading System..."):
             try:
-                st.session_state.trading_system = TradingSystem(
-                    initial_capital=100000,
-                    strategy_name="custom"
-                )
+                st.session_state.trading_system = _new_trading_system(100000, "custom")
             except Exception as e:
                 st.error(f"Failed to initialize trading system: {e}")
                 return
 
     system = st.session_state.trading_system
 
-    # Real-time metrics row
+    # Metrics and actions rerun independently of the rest of the page
+    _metrics_fragment(system)
+
+    st.markdown("---")
+
+    _actions_fragment(system)
+
+@st.fragment
+def _metrics_fragment(system):
+    """Real-time portfolio metrics row"""
     col1, col2, col3, col4 = st.columns(4)
 
     try:
         with col1:
-            portfolio = system.get_performance_report()['portfolio_summary']
+            portfolio = _portfolio_summary(id(system), system)
             create_metric_card("PORTFOLIO VALUE", f"${portfolio['total_equity']:,.2f}")
 
         with col2:
@@ -287,11 +388,10 @@ def dashboard_page():
             create_metric_card("OPEN POSITIONS", f"{portfolio['positions_count']}")
     except Exception as e:
         st.error(f"Error loading portfolio data: {e}")
-        return
 
-    st.markdown("---")
-
-    # Market data and signals
+@st.fragment
+def _actions_fragment(system):
+    """Market data signals and quick action buttons"""
     col1, col2 = st.columns([2, 1])
 
     with col1:
@@ -303,26 +403,35 @@ def dashboard_page():
                 try:
                     signals = system.get_current_signals()
                     st.session_state.current_signals = signals
+                    # Build the frame once per fetch rather than on every rerun
+                    st.session_state.current_signals_df = pd.DataFrame(signals)
                 except Exception as e:
                     st.error(f"Error fetching signals: {e}")
 
-        if hasattr(st.session_state, 'current_signals'):
+        if 'current_signals' in st.session_state:
             if st.session_state.current_signals:
-                signals_df = pd.DataFrame(st.session_state.current_signals)
-                st.dataframe(signals_df, use_container_width=True)
+                st.dataframe(st.session_state.current_signals_df, use_container_width=True)
             else:
                 st.info("No signals generated at this time")
 
     with col2:
         st.markdown("### QUICK ACTIONS")
 
+        # Shown once after the full-page rerun that follows a trade
+        if st.session_state.pop('trade_executed', False):
+            st.success("Trading execution completed!")
+
         if st.button("EXECUTE LIVE TRADING", key="execute_trading"):
             with st.spinner("Executing trades..."):
                 try:
                     system.execute_live_trading()
-                    st.success("Trading execution completed!")
                 except Exception as e:
                     st.error(f"Trading execution failed: {e}")
+                else:
+                    # Rerun the whole app so the metrics fragment picks up the new portfolio
+                    _portfolio_summary.clear()
+                    st.session_state.trade_executed = True
+                    st.rerun()
 
         if st.button("UPDATE DATA", key="update_data"):
             with st.spinner("Updating market data..."):
@@ -339,6 +448,13 @@ def dashboard_page():
             except Exception as e:
                 st.error(f"Export failed: {e}")
 
+STRATEGY_FILE = 'strategy_framework.py'
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_strategy_code(mtime):
+    """Strategy source, re-read only when the file's mtime changes"""
+    return Path(STRATEGY_FILE).read_text()
+
 def strategy_editor_page():
     """Strategy editor page"""
     st.markdown("## STRATEGY EDITOR")
@@ -357,7 +473,7 @@ def strategy_editor_page():
         if st.button("SAVE STRATEGY", key="save_strategy"):
             # Save the current strategy code
             try:
-                with open('strategy_framework.py', 'w') as f:
+                with open(STRATEGY_FILE, 'w') as f:
                     f.write(st.session_state.strategy_code)
                 st.success("Strategy saved successfully!")
             except Exception as e:
@@ -371,24 +487,27 @@ def strategy_editor_page():
     # Load strategy code if not in session state
     if 'strategy_code' not in st.session_state:
         try:
-            with open('strategy_framework.py', 'r') as f:
-                st.session_state.strategy_code = f.read()
-        except:
+            st.session_state.strategy_code = _load_strategy_code(os.path.getmtime(STRATEGY_FILE))
+        except OSError:
             st.session_state.strategy_code = "# Strategy code will appear here"
 
     # Code editor with syntax highlighting
-    edited_code = st_ace(
-        value=st.session_state.strategy_code,
-        language='python',
-        theme='monokai',
-        key="strategy_editor",
-        height=400,
-        auto_update=True,
-        font_size=12,
-        tab_size=4,
-        wrap=False,
-        annotations=None
-    )
+    if ACE_AVAILABLE:
+        from streamlit_ace import st_ace
+        edited_code = st_ace(
+            value=st.session_state.strategy_code,
+            language='python',
+            theme='monokai',
+            key="strategy_editor",
+            height=400,
+            auto_update=True,
+            font_size=12,
+            tab_size=4,
+            wrap=False,
+            annotations=None
+        )
+    else:
+        edited_code = st.text_area("Strategy Code", st.session_state.strategy_code, height=400, key="strategy_editor")
 
     st.session_state.strategy_code = edited_code
 
@@ -421,6 +540,8 @@ def strategy_editor_page():
 
 def backtesting_page():
     """Backtesting page"""
+    import plotly.graph_objects as go
+
     st.markdown("## BACKTESTING ENGINE")
 
     # Backtest parameters
@@ -450,13 +571,13 @@ def backtesting_page():
     # Run backtest button
     if st.button("RUN BACKTEST", key="run_backtest"):
         if st.session_state.trading_system is None:
-            st.session_state.trading_system = TradingSystem(100000, "custom")
+            st.session_state.trading_system = _new_trading_system(100000, "custom")
 
         with st.spinner("Running backtest... This may take a few minutes."):
             try:
                 results = st.session_state.trading_system.run_backtest(
-                    start_date=start_date.strftime('%Y-%m-%d'),
-                    end_date=end_date.strftime('%Y-%m-%d'),
+                    start_date=start_date.isoformat(),
+                    end_date=end_date.isoformat(),
                     timeframe=timeframe
                 )
                 st.session_state.backtest_results = results
@@ -503,15 +624,25 @@ def backtesting_page():
             st.markdown("### EQUITY CURVE")
 
             equity_df = results['equity_curve']
+            # Hand Plotly plain arrays so it doesn't convert the pandas objects itself
+            x = equity_df.index.to_numpy()
+            y = equity_df['equity'].to_numpy(copy=False)
 
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=equity_df.index,
-                y=equity_df['equity'],
+            equity_trace = go.Scattergl(
                 mode='lines',
                 name='Portfolio Value',
                 line=dict(color=BLOOMBERG_COLORS['accent_green'], width=2)
-            ))
+            )
+
+            # Long curves are downsampled before being sent to the browser
+            if RESAMPLER_AVAILABLE and len(y) > 10000:
+                from plotly_resampler import FigureResampler
+                fig = FigureResampler(go.Figure())
+                fig.add_trace(equity_trace, hf_x=x, hf_y=y)
+            else:
+                fig = go.Figure()
+                equity_trace.update(x=x, y=y)
+                fig.add_trace(equity_trace)
 
             fig.update_layout(
                 title="Portfolio Equity Curve",
@@ -525,28 +656,71 @@ def backtesting_page():
 
             st.plotly_chart(fig, use_container_width=True)
 
+def _downsample_ohlc(df, target=1500):
+    """Merge consecutive bars so a chart never carries more than ~target candles"""
+    if len(df) <= target:
+        return df
+    step = -(-len(df) // target)
+    buckets = np.arange(len(df)) // step
+    agg = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
+    if 'volume' in df.columns:
+        agg['volume'] = 'sum'
+    out = df[list(agg)].groupby(buckets).agg(agg)
+    # Each merged bar is stamped with the time of its first source bar
+    out.index = df.index[::step]
+    return out
+
+def _candles_webgl(df, name="Price"):
+    """Candlestick look-alike built from Scattergl traces (wicks plus up/down bodies)"""
+    import plotly.graph_objects as go
+
+    x = df.index.to_numpy()
+    o, h, l, c = (df[k].to_numpy(dtype=float) for k in ('open', 'high', 'low', 'close'))
+    # Each bar is a (start, end, NaN) triple so one trace draws many disjoint segments
+    gap = np.full(len(df), np.nan)
+    traces = [go.Scattergl(
+        x=np.repeat(x, 3),
+        y=np.column_stack([l, h, gap]).ravel(),
+        mode='lines',
+        line=dict(color=BLOOMBERG_COLORS['text_secondary'], width=1),
+        hoverinfo='skip',
+        showlegend=False
+    )]
+
+    up = c >= o
+    for mask, color, label in ((up, BLOOMBERG_COLORS['accent_green'], 'up'),
+                               (~up, BLOOMBERG_COLORS['accent_red'], 'down')):
+        traces.append(go.Scattergl(
+            x=np.repeat(x[mask], 3),
+            y=np.column_stack([o[mask], c[mask], gap[mask]]).ravel(),
+            mode='lines',
+            line=dict(color=color, width=4),
+            name=f"{name} ({label})"
+        ))
+    return traces
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_history(symbol, period, interval):
+    """Price history from yfinance with lowercase columns, cached per symbol/period/interval"""
+    import yfinance as yf
+    data = yf.Ticker(symbol).history(period=period, interval=interval)
+    data.columns = data.columns.str.lower()
+    return data
+
+def _data_hash(data):
+    """Content fingerprint of a price frame, cheap enough to use as a cache key"""
+    return int(pd.util.hash_pandas_object(data, index=True).sum())
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _ict_run(symbol, period, interval, params, data_hash, _strategy, _data):
+    """Market analysis, signals and trading plan in one call, cached per ICT settings and price data"""
+    return _strategy.analyze_market(_data), _strategy.generate_signals(_data), _strategy.get_trading_plan(_data)
+
 def ict_analysis_page():
     """ICT Analysis page"""
     st.markdown("## 🎯 ICT ANALYSIS TOOL")
     st.markdown("*Inner Circle Trader - Institutional Market Structure Analysis*")
 
-    # Initialize ICT strategy if not exists
-    if 'ict_strategy' not in st.session_state:
-        if TRADING_SYSTEM_AVAILABLE:
-            try:
-                from ict_strategy.standalone_ict_strategy import StandaloneICTStrategy
-                st.session_state.ict_strategy = StandaloneICTStrategy({
-                    'trading_style': 'day_trading',
-                    'asset_type': 'forex',
-                    'risk_per_trade': 0.02,
-                    'max_daily_trades': 3,
-                    'confluence_threshold': 0.6
-                })
-            except Exception:
-                st.session_state.ict_strategy = None
-        else:
-            st.session_state.ict_strategy = None
-
     # Symbol selection and configuration
     col1, col2, col3 = st.columns([2, 1, 1])
 
@@ -610,15 +784,34 @@ def ict_analysis_page():
             key="ict_max_trades"
         )
 
-    # Update ICT strategy configuration if available
-    if st.session_state.ict_strategy:
-        st.session_state.ict_strategy.trading_style = trading_style
-        st.session_state.ict_strategy.asset_type = asset_type
-        st.session_state.ict_strategy.confluence_threshold = confluence_threshold
-        st.session_state.ict_strategy.max_daily_trades = max_trades
+    # ICT strategy for the selected configuration
+    st.session_state.ict_strategy = None
+    if TRADING_SYSTEM_AVAILABLE:
+        try:
+            st.session_state.ict_strategy = _get_ict_strategy((
+                ('trading_style', trading_style),
+                ('asset_type', asset_type),
+                ('risk_per_trade', 0.02),
+                ('max_daily_trades', max_trades),
+                ('confluence_threshold', confluence_threshold)
+            ))
+        except Exception:
+            pass
 
-    # Analysis button
-    if st.button("🚀 RUN ICT ANALYSIS", key="run_ict_analysis"):
+    # Analysis buttons
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        run_analysis = st.button("🚀 RUN ICT ANALYSIS", key="run_ict_analysis")
+
+    with col2:
+        # Drop cached price history so the next run hits yfinance again
+        if st.button("🔄 FORCE REFRESH", key="ict_force_refresh"):
+            _fetch_history.clear()
+            _ict_run.clear()
+            run_analysis = True
+
+    if run_analysis:
         if not st.session_state.ict_strategy:
             st.error("❌ ICT Strategy not available. Trading system components are missing.")
             st.info("💡 The system is running in demo mode with limited functionality.")
@@ -632,21 +825,19 @@ def ict_analysis_page():
                         st.error("❌ yfinance not available. Cannot fetch market data.")
                         return
 
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period=period, interval=timeframe)
+                    data = _fetch_history(symbol, period, timeframe)
 
                     if data.empty:
                         st.error(f"No data found for symbol: {symbol}")
                         return
 
-                    # Convert column names to lowercase for consistency
-                    data.columns = [col.lower() for col in data.columns]
-
                     # Store data and analysis in session state
+                    params = (trading_style, asset_type, confluence_threshold, max_trades)
                     st.session_state.ict_data = data
-                    st.session_state.ict_analysis = st.session_state.ict_strategy.analyze_market(data)
-                    st.session_state.ict_signals = st.session_state.ict_strategy.generate_signals(data)
-                    st.session_state.ict_trading_plan = st.session_state.ict_strategy.get_trading_plan(data)
+                    (st.session_state.ict_analysis,
+                     st.session_state.ict_signals,
+                     st.session_state.ict_trading_plan) = _ict_run(symbol, period, timeframe, params, _data_hash(data),
+                                                                   st.session_state.ict_strategy, data)
 
                     st.success(f"✅ Analysis completed for {symbol}")
 
@@ -657,7 +848,7 @@ def ict_analysis_page():
             st.warning("Please enter a symbol to analyze")
 
     # Display analysis results if available
-    if hasattr(st.session_state, 'ict_analysis') and st.session_state.ict_analysis:
+    if st.session_state.get('ict_analysis'):
         display_ict_analysis_results()
 
 def display_ict_analysis_results():
@@ -674,31 +865,160 @@ def display_ict_analysis_results():
     current_price = analysis['current_price']
     symbol = st.session_state.get('ict_symbol', 'Unknown')
 
-    col1, col2, col3, col4 = st.columns(4)
+    # Calculate price change
+    if len(data) > 1:
+        prev_close = data['close'].to_numpy()[-2]
+        price_change_pct = (current_price - prev_close) / prev_close * 100.0
+        change_text = f"{price_change_pct:+.2f}%"
+    else:
+        change_text = "N/A"
+
+    risk_level = trading_plan.get('risk_assessment', {}).get('overall_risk', 'medium')
+
+    # Four metric cards in one CSS grid instead of st.columns(4)
+    st.markdown(
+        '<div class="ict-grid-4">'
+        + metric_card_html("CURRENT PRICE", f"{current_price:.5f}")
+        + metric_card_html("24H CHANGE", change_text)
+        + metric_card_html("SIGNALS FOUND", f"{len(signals)}")
+        + metric_card_html("RISK LEVEL", risk_level.upper())
+        + '</div>',
+        unsafe_allow_html=True
+    )
+
+    po3_analysis = analysis.get('po3_analysis', {})
+    goldbach_analysis = analysis.get('goldbach_analysis', {})
+    institutional_levels = goldbach_analysis.get('institutional_levels', {}) if goldbach_analysis else {}
+
+    # Each section is a fragment so toggling one doesn't rerender the others
+    _po3_fragment(po3_analysis)
+    _goldbach_fragment(goldbach_analysis)
+    _amd_fragment(analysis.get('amd_analysis', {}))
+    _hippo_fragment(analysis.get('hippo_analysis', {}))
+    _signals_fragment(signals, current_price)
+
+    dealing_range = po3_analysis.get('dealing_range', {}) if po3_analysis else {}
+    _ict_chart_fragment(symbol, data, dealing_range, institutional_levels, trading_plan)
+
+@st.fragment
+def _ict_chart_fragment(symbol, data, dealing_range, institutional_levels, trading_plan):
+    """Trading plan and price chart with ICT levels"""
+    # Trading Plan
+    st.markdown("### 📋 TRADING PLAN")
+
+    recommendations = trading_plan.get('recommendations', [])
+    risk_assessment = trading_plan.get('risk_assessment', {})
+
+    col1, col2 = st.columns(2)
 
     with col1:
-        create_metric_card("CURRENT PRICE", f"{current_price:.5f}")
+        lines = ["**📝 Recommendations**", ""]
+        if recommendations:
+            lines += [f"{i}. {rec}" for i, rec in enumerate(recommendations, 1)]
+        else:
+            lines.append("No specific recommendations at this time")
+        st.markdown("\n".join(lines))
 
     with col2:
-        # Calculate price change
-        if len(data) > 1:
-            price_change = current_price - data['close'].iloc[-2]
-            price_change_pct = (price_change / data['close'].iloc[-2]) * 100
-            create_metric_card("24H CHANGE", f"{price_change_pct:+.2f}%")
+        risk_level = risk_assessment.get('overall_risk', 'medium')
+        risk_factors = risk_assessment.get('factors', [])
+
+        risk_color = _RISK_COLOR.get(risk_level, BLOOMBERG_COLORS['text_secondary'])
+
+        lines = [
+            "**⚠️ Risk Assessment**",
+            "",
+            f'- **Overall Risk**: <span style="color: {risk_color};">{risk_level.upper()}</span>'
+        ]
+
+        if risk_factors:
+            lines.append("- **Risk Factors**:")
+            lines += [f"  - {factor}" for factor in risk_factors]
         else:
-            create_metric_card("24H CHANGE", "N/A")
+            lines.append("- **Risk Factors**: None identified")
+        st.markdown("\n".join(lines), unsafe_allow_html=True)
 
-    with col3:
-        create_metric_card("SIGNALS FOUND", f"{len(signals)}")
+    # Price Chart with ICT Levels
+    st.markdown("### 📊 PRICE CHART WITH ICT LEVELS")
 
-    with col4:
-        risk_level = trading_plan.get('risk_assessment', {}).get('overall_risk', 'medium')
-        create_metric_card("RISK LEVEL", risk_level.upper())
+    if len(data) > 0:
+        # Per-session reuse first, so a hit skips even the shared cache's copy
+        fig = _session_figure(
+            ('ict', symbol, data.index[-1], len(data), repr(dealing_range), repr(institutional_levels)),
+            lambda: _ict_figure(symbol, data.index[-1], len(data), dealing_range, institutional_levels, data)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _ict_figure(symbol, last_bar, n_bars, dealing_range, institutional_levels, _data):
+    """ICT price chart, rebuilt only when the bars or plotted levels change"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    # Candlestick chart
+    candles = _downsample_ohlc(_data)
+    # Long series are drawn with WebGL; SVG candlesticks stall past a few hundred bars
+    if len(candles) > 500:
+        fig.add_traces(_candles_webgl(candles))
+    else:
+        fig.add_trace(go.Candlestick(
+            x=candles.index,
+            open=candles['open'],
+            high=candles['high'],
+            low=candles['low'],
+            close=candles['close'],
+            name="Price",
+            increasing_line_color=BLOOMBERG_COLORS['accent_green'],
+            decreasing_line_color=BLOOMBERG_COLORS['accent_red']
+        ))
 
-    # Power of Three Analysis
+    # Levels are drawn as one line trace per color (None-separated segments)
+    # instead of one layout shape per add_hline call
+    x0, x1 = candles.index[0], candles.index[-1]
+    level_groups = [
+        ("PO3 High", BLOOMBERG_COLORS['accent_red'], "dash", [("PO3 High", dealing_range.get('range_high'))]),
+        ("PO3 Low", BLOOMBERG_COLORS['accent_green'], "dash", [("PO3 Low", dealing_range.get('range_low'))]),
+        ("Equilibrium", BLOOMBERG_COLORS['accent_yellow'], "dot", [("Equilibrium", dealing_range.get('equilibrium'))]),
+        ("Goldbach Levels", BLOOMBERG_COLORS['accent_blue'], "dashdot", [
+            (level_name.replace('_', ' ').title(), price)
+            for level_name, price in institutional_levels.items()
+            if 'equilibrium' not in level_name  # Don't duplicate equilibrium
+        ])
+    ]
+
+    for name, color, dash, levels in level_groups:
+        levels = [(label, price) for label, price in levels if price is not None]
+        if not levels:
+            continue
+        fig.add_trace(go.Scatter(
+            x=[x for _ in levels for x in (x0, x1, None)],
+            y=[y for _, price in levels for y in (price, price, None)],
+            text=[t for label, _ in levels for t in (label, label, None)],
+            mode='lines',
+            name=name,
+            line=dict(color=color, dash=dash, width=1),
+            hovertemplate="%{text}: %{y:.5f}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=f"ICT Analysis - {symbol}",
+        xaxis_title="Time",
+        yaxis_title="Price",
+        plot_bgcolor=BLOOMBERG_COLORS['bg_secondary'],
+        paper_bgcolor=BLOOMBERG_COLORS['bg_primary'],
+        font=dict(color=BLOOMBERG_COLORS['text_primary']),
+        showlegend=True,
+        height=600
+    )
+
+    return fig
+
+@st.fragment
+def _po3_fragment(po3_analysis):
+    """Power of Three analysis section"""
     st.markdown("### 🎯 POWER OF THREE (PO3) ANALYSIS")
 
-    po3_analysis = analysis.get('po3_analysis', {})
     if po3_analysis:
         dealing_range = po3_analysis.get('dealing_range', {})
         price_position = po3_analysis.get('price_position', {})
@@ -706,8 +1026,9 @@ def display_ict_analysis_results():
         col1, col2 = st.columns(2)
 
         with col1:
-            st.markdown("**📊 Dealing Range**")
             st.markdown(f"""
+            **📊 Dealing Range**
+
             - **Optimal PO3 Size**: {po3_analysis.get('optimal_size', 'N/A')}
             - **Range Low**: {dealing_range.get('range_low', 'N/A'):.5f}
             - **Range High**: {dealing_range.get('range_high', 'N/A'):.5f}
@@ -719,31 +1040,22 @@ def display_ict_analysis_results():
             strength = price_position.get('strength', 0)
 
             # Color code the zone
-            if zone == 'DISCOUNT':
-                zone_color = BLOOMBERG_COLORS['accent_green']
-                zone_emoji = "🟢"
-                bias = "BULLISH BIAS"
-            elif zone == 'PREMIUM':
-                zone_color = BLOOMBERG_COLORS['accent_red']
-                zone_emoji = "🔴"
-                bias = "BEARISH BIAS"
-            else:
-                zone_color = BLOOMBERG_COLORS['accent_yellow']
-                zone_emoji = "🟡"
-                bias = "NEUTRAL"
+            zone_emoji, bias = _ZONE_STYLE.get(zone, ("🟡", "NEUTRAL"))
 
-            st.markdown("**🎯 Price Position**")
             st.markdown(f"""
+            **🎯 Price Position**
+
             - **Current Zone**: {zone_emoji} {zone}
             - **Zone Strength**: {strength:.2f}
             - **Market Bias**: {bias}
             - **Position %**: {price_position.get('position_percentage', 0)*100:.1f}%
             """)
 
-    # Goldbach/IPDA Analysis
+@st.fragment
+def _goldbach_fragment(goldbach_analysis):
+    """Goldbach/IPDA levels section"""
     st.markdown("### 🎯 GOLDBACH/IPDA LEVELS")
 
-    goldbach_analysis = analysis.get('goldbach_analysis', {})
     if goldbach_analysis:
         nearest_level = goldbach_analysis.get('nearest_level')
         institutional_levels = goldbach_analysis.get('institutional_levels', {})
@@ -751,229 +1063,138 @@ def display_ict_analysis_results():
         col1, col2 = st.columns(2)
 
         with col1:
-            st.markdown("**🏛️ Institutional Levels**")
-            if institutional_levels:
-                for level_name, price in institutional_levels.items():
-                    level_display = level_name.replace('_', ' ').title()
-                    st.markdown(f"- **{level_display}**: {price:.5f}")
+            rows = "\n".join(
+                f"- **{name.replace('_', ' ').title()}**: {price:.5f}"
+                for name, price in institutional_levels.items()
+            )
+            st.markdown("**🏛️ Institutional Levels**\n\n" + rows)
 
         with col2:
             if nearest_level:
                 distance_pips = nearest_level.get('distance', 0) * 10000
-                st.markdown("**📍 Nearest Level**")
                 st.markdown(f"""
+                **📍 Nearest Level**
+
                 - **Type**: {nearest_level.get('level_type', 'N/A').replace('_', ' ').title()}
                 - **Price**: {nearest_level.get('price', 'N/A'):.5f}
                 - **Distance**: {distance_pips:.1f} pips
                 - **Weight**: {nearest_level.get('weight', 0):.2f}
                 """)
 
-    # AMD Cycle Analysis
+# AMD phase display details
+_PHASE_INFO = {
+    'accumulation': {'emoji': '📊', 'color': BLOOMBERG_COLORS['accent_blue'], 'description': 'Asian Range - Analysis Phase'},
+    'manipulation': {'emoji': '🔥', 'color': BLOOMBERG_COLORS['accent_orange'], 'description': 'London Session - Prime Entry Window'},
+    'distribution': {'emoji': '💼', 'color': BLOOMBERG_COLORS['accent_green'], 'description': 'NY Session - Management Phase'}
+}
+_UNKNOWN_PHASE = {'emoji': '❓', 'color': BLOOMBERG_COLORS['text_secondary'], 'description': 'Unknown Phase'}
+
+@st.fragment
+def _amd_fragment(amd_analysis):
+    """AMD cycle analysis section"""
     st.markdown("### ⏰ AMD CYCLE ANALYSIS")
 
-    amd_analysis = analysis.get('amd_analysis', {})
     current_phase = amd_analysis.get('current_phase', 'unknown')
 
     col1, col2 = st.columns(2)
 
     with col1:
         # Current phase with emoji and color
-        phase_info = {
-            'accumulation': {'emoji': '📊', 'color': BLOOMBERG_COLORS['accent_blue'], 'description': 'Asian Range - Analysis Phase'},
-            'manipulation': {'emoji': '🔥', 'color': BLOOMBERG_COLORS['accent_orange'], 'description': 'London Session - Prime Entry Window'},
-            'distribution': {'emoji': '💼', 'color': BLOOMBERG_COLORS['accent_green'], 'description': 'NY Session - Management Phase'}
-        }
-
-        phase_data = phase_info.get(current_phase, {'emoji': '❓', 'color': BLOOMBERG_COLORS['text_secondary'], 'description': 'Unknown Phase'})
+        phase_data = _PHASE_INFO.get(current_phase, _UNKNOWN_PHASE)
 
-        st.markdown("**⏰ Current AMD Phase**")
         st.markdown(f"""
+        **⏰ Current AMD Phase**
+
         - **Phase**: {phase_data['emoji']} {current_phase.upper()}
         - **Description**: {phase_data['description']}
         - **Optimal Action**: {'Enter Trades' if current_phase == 'manipulation' else 'Analyze' if current_phase == 'accumulation' else 'Manage Positions'}
         """)
 
     with col2:
-        st.markdown("**🕐 Session Timing (CET)**")
         st.markdown("""
+        **🕐 Session Timing (CET)**
+
         - **Asian (A)**: 20:00 - 05:00 (9 hours)
         - **London (M)**: 05:00 - 11:00 (6 hours) 🔥
         - **New York (D)**: 11:00 - 20:00 (9 hours)
         """)
 
-    # HIPPO Pattern Analysis
+@st.fragment
+def _hippo_fragment(hippo_analysis):
+    """HIPPO pattern analysis section"""
     st.markdown("### 🎪 HIPPO PATTERN ANALYSIS")
 
-    hippo_analysis = analysis.get('hippo_analysis', {})
     partition_info = hippo_analysis.get('partition_info', {})
     patterns = hippo_analysis.get('patterns', [])
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("**📅 Lookback Partition**")
         st.markdown(f"""
+        **📅 Lookback Partition**
+
         - **Current Month Number**: {partition_info.get('partition_number', 'N/A')}
         - **Days into Partition**: {partition_info.get('days_into_partition', 'N/A')}
         - **Partition Start**: {partition_info.get('partition_start', 'N/A')}
         """)
 
     with col2:
-        st.markdown("**🎪 HIPPO Patterns Found**")
+        lines = ["**🎪 HIPPO Patterns Found**", ""]
         if patterns:
             for i, pattern in enumerate(patterns[:3], 1):  # Show first 3 patterns
                 if pattern.get('is_hippo'):
-                    st.markdown(f"""
-                    **Pattern {i}:**
-                    - Type: {pattern.get('pattern_type', 'N/A')}
-                    - Direction: {pattern.get('direction', 'N/A')}
-                    - Hidden Level: {pattern.get('hidden_level', 'N/A'):.5f}
-                    """)
+                    lines += [
+                        f"**Pattern {i}:**",
+                        f"- Type: {pattern.get('pattern_type', 'N/A')}",
+                        f"- Direction: {pattern.get('direction', 'N/A')}",
+                        f"- Hidden Level: {pattern.get('hidden_level', 'N/A'):.5f}",
+                        ""
+                    ]
         else:
-            st.markdown("No HIPPO patterns detected in current timeframe")
-
-    # Trading Signals
+            lines.append("No HIPPO patterns detected in current timeframe")
+        st.markdown("\n".join(lines))
+
+# Signal expander body: details and risk side by side in a single markdown element
+_SIGNAL_TMPL = (
+    '<div style="display: flex; gap: 2rem;">'
+    '<div style="flex: 1;"><b>Signal Details:</b><br>'
+    '- <b>Direction</b>: {dir_emoji} {direction}<br>'
+    '- <b>Entry Price</b>: {entry:.5f}<br>'
+    '- <b>Confluence Score</b>: {confluence:.2f}<br>'
+    '- <b>Strength</b>: {strength:.2f}</div>'
+    '<div style="flex: 1;"><b>Risk Management:</b><br>'
+    '- <b>Stop Loss</b>: {stop_loss}<br>'
+    '- <b>Take Profit</b>: {take_profit}<br>'
+    '- <b>Reasoning</b>: {reasoning}</div>'
+    '</div>'
+)
+
+@st.fragment
+def _signals_fragment(signals, current_price):
+    """Trading signals section"""
     if signals:
         st.markdown("### 🚨 TRADING SIGNALS")
 
         for i, signal in enumerate(signals, 1):
+            signal_view = {
+                'dir_emoji': "🟢" if signal.get('direction') == 'long' else "🔴",
+                'direction': signal.get('direction', 'N/A').upper(),
+                'entry': signal.get('entry_price', current_price),
+                'confluence': signal.get('confluence_score', 0),
+                'strength': signal.get('strength', 0),
+                'stop_loss': signal.get('stop_loss', 'N/A'),
+                'take_profit': signal.get('take_profit', 'N/A'),
+                'reasoning': signal.get('reasoning', 'N/A')
+            }
             with st.expander(f"🎯 Signal #{i}: {signal.get('type', 'Unknown').replace('_', ' ').title()}", expanded=True):
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    direction_emoji = "🟢" if signal.get('direction') == 'long' else "🔴"
-                    st.markdown(f"""
-                    **Signal Details:**
-                    - **Direction**: {direction_emoji} {signal.get('direction', 'N/A').upper()}
-                    - **Entry Price**: {signal.get('entry_price', current_price):.5f}
-                    - **Confluence Score**: {signal.get('confluence_score', 0):.2f}
-                    - **Strength**: {signal.get('strength', 0):.2f}
-                    """)
-
-                with col2:
-                    st.markdown(f"""
-                    **Risk Management:**
-                    - **Stop Loss**: {signal.get('stop_loss', 'N/A')}
-                    - **Take Profit**: {signal.get('take_profit', 'N/A')}
-                    - **Reasoning**: {signal.get('reasoning', 'N/A')}
-                    """)
-
-    # Trading Plan
-    st.markdown("### 📋 TRADING PLAN")
-
-    recommendations = trading_plan.get('recommendations', [])
-    risk_assessment = trading_plan.get('risk_assessment', {})
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**📝 Recommendations**")
-        if recommendations:
-            for i, rec in enumerate(recommendations, 1):
-                st.markdown(f"{i}. {rec}")
-        else:
-            st.markdown("No specific recommendations at this time")
-
-    with col2:
-        risk_level = risk_assessment.get('overall_risk', 'medium')
-        risk_factors = risk_assessment.get('factors', [])
-
-        risk_color = {
-            'low': BLOOMBERG_COLORS['accent_green'],
-            'medium': BLOOMBERG_COLORS['accent_yellow'],
-            'high': BLOOMBERG_COLORS['accent_red']
-        }.get(risk_level, BLOOMBERG_COLORS['text_secondary'])
-
-        st.markdown("**⚠️ Risk Assessment**")
-        st.markdown(f"- **Overall Risk**: {risk_level.upper()}")
-
-        if risk_factors:
-            st.markdown("- **Risk Factors**:")
-            for factor in risk_factors:
-                st.markdown(f"  - {factor}")
-        else:
-            st.markdown("- **Risk Factors**: None identified")
-
-    # Price Chart with ICT Levels
-    st.markdown("### 📊 PRICE CHART WITH ICT LEVELS")
-
-    if len(data) > 0:
-        fig = go.Figure()
-
-        # Candlestick chart
-        fig.add_trace(go.Candlestick(
-            x=data.index,
-            open=data['open'],
-            high=data['high'],
-            low=data['low'],
-            close=data['close'],
-            name="Price",
-            increasing_line_color=BLOOMBERG_COLORS['accent_green'],
-            decreasing_line_color=BLOOMBERG_COLORS['accent_red']
-        ))
-
-        # Add PO3 levels
-        if po3_analysis:
-            dealing_range = po3_analysis.get('dealing_range', {})
-
-            # Range high
-            if 'range_high' in dealing_range:
-                fig.add_hline(
-                    y=dealing_range['range_high'],
-                    line_dash="dash",
-                    line_color=BLOOMBERG_COLORS['accent_red'],
-                    annotation_text="PO3 High"
-                )
-
-            # Range low
-            if 'range_low' in dealing_range:
-                fig.add_hline(
-                    y=dealing_range['range_low'],
-                    line_dash="dash",
-                    line_color=BLOOMBERG_COLORS['accent_green'],
-                    annotation_text="PO3 Low"
-                )
-
-            # Equilibrium
-            if 'equilibrium' in dealing_range:
-                fig.add_hline(
-                    y=dealing_range['equilibrium'],
-                    line_dash="dot",
-                    line_color=BLOOMBERG_COLORS['accent_yellow'],
-                    annotation_text="Equilibrium"
-                )
-
-        # Add Goldbach levels
-        if goldbach_analysis and institutional_levels:
-            for level_name, price in institutional_levels.items():
-                if 'equilibrium' not in level_name:  # Don't duplicate equilibrium
-                    fig.add_hline(
-                        y=price,
-                        line_dash="dashdot",
-                        line_color=BLOOMBERG_COLORS['accent_blue'],
-                        annotation_text=level_name.replace('_', ' ').title(),
-                        annotation_position="bottom right"
-                    )
-
-        fig.update_layout(
-            title=f"ICT Analysis - {st.session_state.get('ict_symbol', 'Unknown')}",
-            xaxis_title="Time",
-            yaxis_title="Price",
-            plot_bgcolor=BLOOMBERG_COLORS['bg_secondary'],
-            paper_bgcolor=BLOOMBERG_COLORS['bg_primary'],
-            font=dict(color=BLOOMBERG_COLORS['text_primary']),
-            showlegend=True,
-            height=600
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+                st.markdown(_SIGNAL_TMPL.format_map(signal_view), unsafe_allow_html=True)
 
 def risk_management_page():
     """Risk management page"""
     st.markdown("## 🛡️ RISK MANAGEMENT")
 
     if st.session_state.trading_system is None:
-        st.session_state.trading_system = TradingSystem(100000, "custom")
+        st.session_state.trading_system = _new_trading_system(100000, "custom")
 
     system = st.session_state.trading_system
     portfolio = system.get_performance_report()['portfolio_summary']
@@ -1147,6 +1368,9 @@ def settings_page():
     # Data source settings
     st.markdown("### 📡 DATA SOURCES")
 
+    # Server keys stay on the server; the inputs only ever hold what this user types
+    key_status = api_key_status()
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -1161,6 +1385,8 @@ def settings_page():
             type="password",
             key="av_key"
         )
+        if key_status['av_key']:
+            st.caption("✅ Key configured on server")
 
     with col2:
         update_frequency = st.selectbox(
@@ -1175,12 +1401,16 @@ def settings_page():
             type="password",
             key="fred_key"
         )
+        if key_status['fred_key']:
+            st.caption("✅ Key configured on server")
 
     # Save settings
     if st.button("💾 SAVE SETTINGS", key="save_settings"):
         try:
             # Here you would save settings to config file
+            # API keys are never stored from this page; they are configured on the server
             st.success("Settings saved successfully!")
+            st.info("💡 API keys are set on the server with keyring or the ALPHA_VANTAGE_KEY / FRED_API_KEY environment variables.")
         except Exception as e:
             st.error(f"Error saving settings: {e}")
 
@@ -1190,16 +1420,98 @@ def settings_page():
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        st.markdown('<div class="status-green">🟢 Trading System: ONLINE</div>', unsafe_allow_html=True)
-        st.markdown('<div class="status-green">🟢 Data Feed: CONNECTED</div>', unsafe_allow_html=True)
+        st.markdown(_badge('green', '🟢 Trading System: ONLINE'), unsafe_allow_html=True)
+        st.markdown(_badge('green', '🟢 Data Feed: CONNECTED'), unsafe_allow_html=True)
 
     with col2:
-        st.markdown('<div class="status-green">🟢 Risk Manager: ACTIVE</div>', unsafe_allow_html=True)
-        st.markdown('<div class="status-yellow">🟡 Paper Trading: ENABLED</div>', unsafe_allow_html=True)
+        st.markdown(_badge('green', '🟢 Risk Manager: ACTIVE'), unsafe_allow_html=True)
+        st.markdown(_badge('yellow', '🟡 Paper Trading: ENABLED'), unsafe_allow_html=True)
 
     with col3:
-        st.markdown('<div class="status-green">🟢 Database: CONNECTED</div>', unsafe_allow_html=True)
-        st.markdown('<div class="status-green">🟢 Backtesting: READY</div>', unsafe_allow_html=True)
+        st.markdown(_badge('green', '🟢 Database: CONNECTED'), unsafe_allow_html=True)
+        st.markdown(_badge('green', '🟢 Backtesting: READY'), unsafe_allow_html=True)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _multi_quotes(symbols, api_id, _api):
+    """Quotes for a symbol tuple, cached so repeated quick-access clicks skip the network"""
+    return _api.get_multiple_quotes(list(symbols))
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _search_symbols(query, limit, api_id, _api):
+    """Symbol search results, cached per query"""
+    return _api.search_symbols(query, limit=limit)
+
+# Disk-persisted caches ignore ttl, so staleness is bounded by a time-bucket key
+# argument instead; the bucket (not id(api)) keeps keys stable across restarts
+@st.cache_data(persist='disk', max_entries=64, show_spinner=False)
+def _market_data(symbol, period, interval, bucket, _api):
+    """OHLCV history, cached per symbol/period/interval and 5-minute bucket"""
+    return _api.get_market_data(symbol, period=period, interval=interval)
+
+@st.cache_data(persist='disk', max_entries=64, show_spinner=False)
+def _fundamentals(symbol, bucket, _api):
+    """Symbol fundamentals; these change slowly so they use an hourly bucket"""
+    return _api.get_symbol_fundamentals(symbol)
+
+_QUOTE_FORMATS = {'Price': '${:.2f}', 'Change': '{:+.2f}', 'Change %': '{:+.2f}%', 'Volume': '{:,.0f}'}
+
+def _quotes_frame(quotes, extra_label, extra_key):
+    """Quote dict -> DataFrame built column-wise; symbols without a price are dropped"""
+    symbols = list(quotes)
+    values = list(quotes.values())
+    df = pd.DataFrame({
+        'Symbol': symbols,
+        'Price': np.array([q.get('price') for q in values], dtype=float),
+        'Change': np.array([q.get('change', 0) for q in values], dtype=float),
+        'Change %': np.array([q.get('change_percent', 0) for q in values], dtype=float),
+        'Volume': np.array([q.get('volume', 0) for q in values], dtype=float),
+        extra_label: [q.get(extra_key, 'N/A') for q in values]
+    })
+    return df.dropna(subset=['Price']).reset_index(drop=True)
+
+def _change_color(value):
+    """Green/red text for positive/negative changes in styled tables"""
+    return _POS_STYLE if value > 0 else _NEG_STYLE
+
+def _session_figure(key, build):
+    """Figure from a small per-session LRU; build() is only called on a miss"""
+    figures = st.session_state.setdefault('_figure_cache', OrderedDict())
+    fig = figures.get(key)
+    if fig is None:
+        fig = figures[key] = build()
+        if len(figures) > 8:
+            figures.popitem(last=False)
+    else:
+        figures.move_to_end(key)
+    return fig
+
+def _detail_figure(symbol, market_data):
+    """Candlestick chart for the market data detailed view"""
+    import plotly.graph_objects as go
+
+    candles = _downsample_ohlc(market_data)
+    if len(candles) > 500:
+        fig = go.Figure(data=_candles_webgl(candles, name=symbol))
+    else:
+        fig = go.Figure(data=go.Candlestick(
+            x=candles.index,
+            open=candles['open'],
+            high=candles['high'],
+            low=candles['low'],
+            close=candles['close'],
+            name=symbol
+        ))
+
+    fig.update_layout(
+        title=f"{symbol} - 5 Day Hourly Chart",
+        xaxis_title="Time",
+        yaxis_title="Price",
+        plot_bgcolor=BLOOMBERG_COLORS['bg_secondary'],
+        paper_bgcolor=BLOOMBERG_COLORS['bg_primary'],
+        font=dict(color=BLOOMBERG_COLORS['text_primary']),
+        height=400
+    )
+    return fig
 
 def market_data_page():
     """Market data and symbol lookup page"""
@@ -1224,7 +1536,7 @@ def market_data_page():
         if st.button("🔍 SEARCH", key="search_btn"):
             if search_query:
                 with st.spinner("Searching symbols..."):
-                    results = market_api.search_symbols(search_query, limit=10)
+                    results = _search_symbols(search_query, 10, id(market_api), market_api)
                     st.session_state.search_results = results
 
     with col3:
@@ -1234,31 +1546,30 @@ def market_data_page():
                 st.success(f"Added {search_query.upper()} to watchlist")
 
     # Display search results
-    if hasattr(st.session_state, 'search_results') and st.session_state.search_results:
+    if st.session_state.search_results:
         st.markdown("#### 🎯 SEARCH RESULTS")
 
+        # One HTML table for all results instead of a row of columns per symbol
+        rows = []
         for symbol_info in st.session_state.search_results:
-            col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
-
-            with col1:
-                st.markdown(f"**{symbol_info.symbol}**")
-
-            with col2:
-                st.markdown(f"{symbol_info.name[:40]}...")
+            if symbol_info.price:
+                color = 'green' if symbol_info.change and symbol_info.change > 0 else 'red'
+                price_cell = _STATUS_HTML[color].format(f"${symbol_info.price:.2f}")
+            else:
+                price_cell = "N/A"
 
-            with col3:
-                if symbol_info.price:
-                    color = "status-green" if symbol_info.change and symbol_info.change > 0 else "status-red"
-                    st.markdown(f'<div class="{color}">${symbol_info.price:.2f}</div>', unsafe_allow_html=True)
-                else:
-                    st.markdown("N/A")
+            if symbol_info.change_percent:
+                color = 'green' if symbol_info.change_percent > 0 else 'red'
+                change_cell = _STATUS_HTML[color].format(f"{symbol_info.change_percent:+.2f}%")
+            else:
+                change_cell = "N/A"
 
-            with col4:
-                if symbol_info.change_percent:
-                    color = "status-green" if symbol_info.change_percent > 0 else "status-red"
-                    st.markdown(f'<div class="{color}">{symbol_info.change_percent:+.2f}%</div>', unsafe_allow_html=True)
-                else:
-                    st.markdown("N/A")
+            rows.append(
+                f"<tr><td><b>{html.escape(symbol_info.symbol)}</b></td>"
+                f"<td>{html.escape(symbol_info.name[:40])}...</td>"
+                f"<td>{price_cell}</td><td>{change_cell}</td></tr>"
+            )
+        st.markdown('<table class="search-results">' + ''.join(rows) + '</table>', unsafe_allow_html=True)
 
     st.markdown("---")
 
@@ -1270,47 +1581,36 @@ def market_data_page():
     with col1:
         if st.button("📈 POPULAR STOCKS", key="popular_stocks"):
             popular = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX']
-            quotes = market_api.get_multiple_quotes(popular)
+            quotes = _multi_quotes(tuple(popular), id(market_api), market_api)
             st.session_state.quick_quotes = quotes
 
     with col2:
         if st.button("🔮 FUTURES", key="futures_btn"):
             futures = ['ES', 'NQ', 'YM', 'RTY', 'CL', 'GC']
-            quotes = market_api.get_multiple_quotes(futures)
+            quotes = _multi_quotes(tuple(futures), id(market_api), market_api)
             st.session_state.quick_quotes = quotes
 
     with col3:
         if st.button("💱 FOREX", key="forex_btn"):
             forex = ['EURUSD', 'GBPUSD', 'AUDUSD', 'USDJPY', 'USDCAD']
-            quotes = market_api.get_multiple_quotes(forex)
+            quotes = _multi_quotes(tuple(forex), id(market_api), market_api)
             st.session_state.quick_quotes = quotes
 
     with col4:
         if st.button("₿ CRYPTO", key="crypto_btn"):
             crypto = ['BTC-USD', 'ETH-USD', 'ADA-USD', 'DOT-USD']
-            quotes = market_api.get_multiple_quotes(crypto)
+            quotes = _multi_quotes(tuple(crypto), id(market_api), market_api)
             st.session_state.quick_quotes = quotes
 
     # Display quick quotes
-    if hasattr(st.session_state, 'quick_quotes') and st.session_state.quick_quotes:
+    if st.session_state.quick_quotes:
         st.markdown("#### 📊 REAL-TIME QUOTES")
 
         # Create a DataFrame for better display
-        quote_data = []
-        for symbol, quote in st.session_state.quick_quotes.items():
-            if quote.get('price') is not None:
-                quote_data.append({
-                    'Symbol': symbol,
-                    'Price': f"${quote['price']:.2f}",
-                    'Change': f"{quote.get('change', 0):+.2f}",
-                    'Change %': f"{quote.get('change_percent', 0):+.2f}%",
-                    'Volume': f"{quote.get('volume', 0):,}",
-                    'Exchange': quote.get('exchange', 'N/A')
-                })
-
-        if quote_data:
-            df = pd.DataFrame(quote_data)
-            st.dataframe(df, use_container_width=True)
+        df = _quotes_frame(st.session_state.quick_quotes, 'Exchange', 'exchange')
+
+        if not df.empty:
+            st.dataframe(df.style.format(_QUOTE_FORMATS), use_container_width=True)
 
     st.markdown("---")
 
@@ -1333,81 +1633,43 @@ def market_data_page():
             st.success("Watchlist cleared")
 
     # Display watchlist
-    if hasattr(st.session_state, 'watchlist_quotes') and st.session_state.watchlist_quotes:
-        watchlist_data = []
-        for symbol, quote in st.session_state.watchlist_quotes.items():
-            if quote.get('price') is not None:
-                watchlist_data.append({
-                    'Symbol': symbol,
-                    'Price': quote['price'],
-                    'Change': quote.get('change', 0),
-                    'Change %': quote.get('change_percent', 0),
-                    'Volume': quote.get('volume', 0),
-                    'Last Update': quote.get('timestamp', 'N/A')
-                })
-
-        if watchlist_data:
-            df = pd.DataFrame(watchlist_data)
-
-            # Create colored display
-            for idx, row in df.iterrows():
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-
-                with col1:
-                    st.markdown(f"**{row['Symbol']}**")
-
-                with col2:
-                    st.markdown(f"${row['Price']:.2f}")
-
-                with col3:
-                    color = "status-green" if row['Change'] > 0 else "status-red"
-                    st.markdown(f'<div class="{color}">{row["Change"]:+.2f}</div>', unsafe_allow_html=True)
-
-                with col4:
-                    color = "status-green" if row['Change %'] > 0 else "status-red"
-                    st.markdown(f'<div class="{color}">{row["Change %"]:+.2f}%</div>', unsafe_allow_html=True)
-
-                with col5:
-                    st.markdown(f"{row['Volume']:,}")
-
-                with col6:
-                    if st.button("📊", key=f"chart_{row['Symbol']}", help="View Chart"):
-                        st.session_state.selected_symbol = row['Symbol']
+    if st.session_state.watchlist_quotes:
+        df = _quotes_frame(st.session_state.watchlist_quotes, 'Last Update', 'timestamp')
+
+        if not df.empty:
+            # One styled table instead of a row of columns per symbol
+            styled = df.style.map(_change_color, subset=['Change', 'Change %']).format(_QUOTE_FORMATS)
+            st.dataframe(styled, use_container_width=True, hide_index=True)
+
+            chart_symbol = st.selectbox(
+                "📊 View Chart",
+                df['Symbol'],
+                index=None,
+                placeholder="Select a watchlist symbol",
+                key="watchlist_chart"
+            )
+            if chart_symbol:
+                st.session_state.selected_symbol = chart_symbol
 
     # Detailed symbol view
-    if hasattr(st.session_state, 'selected_symbol'):
+    if st.session_state.selected_symbol:
         symbol = st.session_state.selected_symbol
         st.markdown(f"### 📈 DETAILED VIEW: {symbol}")
 
         # Get market data
         with st.spinner(f"Loading data for {symbol}..."):
-            market_data = market_api.get_market_data(symbol, period='5d', interval='1h')
+            market_data = _market_data(symbol, '5d', '1h', int(time.time() // 300), market_api)
 
             if market_data is not None and not market_data.empty:
-                # Create candlestick chart
-                fig = go.Figure(data=go.Candlestick(
-                    x=market_data.index,
-                    open=market_data['open'],
-                    high=market_data['high'],
-                    low=market_data['low'],
-                    close=market_data['close'],
-                    name=symbol
-                ))
-
-                fig.update_layout(
-                    title=f"{symbol} - 5 Day Hourly Chart",
-                    xaxis_title="Time",
-                    yaxis_title="Price",
-                    plot_bgcolor=BLOOMBERG_COLORS['bg_secondary'],
-                    paper_bgcolor=BLOOMBERG_COLORS['bg_primary'],
-                    font=dict(color=BLOOMBERG_COLORS['text_primary']),
-                    height=400
+                # Create candlestick chart, reusing this session's figure if the bars haven't changed
+                fig = _session_figure(
+                    ('detail', symbol, market_data.index[-1], len(market_data)),
+                    lambda: _detail_figure(symbol, market_data)
                 )
-
                 st.plotly_chart(fig, use_container_width=True)
 
                 # Show fundamentals if available
-                fundamentals = market_api.get_symbol_fundamentals(symbol)
+                fundamentals = _fundamentals(symbol, int(time.time() // 3600), market_api)
                 if fundamentals:
                     st.markdown("#### 📊 FUNDAMENTALS")
 
@@ -1431,6 +1693,17 @@ def market_data_page():
             else:
                 st.error(f"Could not load data for {symbol}")
 
+# Sidebar label -> page function; also defines the navigation order
+PAGES = {
+    "Dashboard": dashboard_page,
+    "Market Data": market_data_page,
+    "ICT Analysis": ict_analysis_page,
+    "Strategy Editor": strategy_editor_page,
+    "Backtesting": backtesting_page,
+    "Risk Management": risk_management_page,
+    "Settings": settings_page
+}
+
 def main():
     """Main unified application"""
     st.set_page_config(
@@ -1467,22 +1740,23 @@ def main():
 
         # Check component availability
         if TRADING_SYSTEM_AVAILABLE:
-            st.markdown('<div class="status-green">🟢 Trading System: READY</div>', unsafe_allow_html=True)
+            st.markdown(_badge('green', '🟢 Trading System: READY'), unsafe_allow_html=True)
         else:
-            st.markdown('<div class="status-red">🔴 Trading System: LIMITED</div>', unsafe_allow_html=True)
+            st.markdown(_badge('red', '🔴 Trading System: LIMITED'), unsafe_allow_html=True)
 
         if YFINANCE_AVAILABLE:
-            st.markdown('<div class="status-green">🟢 Market Data: CONNECTED</div>', unsafe_allow_html=True)
+            st.markdown(_badge('green', '🟢 Market Data: CONNECTED'), unsafe_allow_html=True)
         else:
-            st.markdown('<div class="status-red">🔴 Market Data: OFFLINE</div>', unsafe_allow_html=True)
+            st.markdown(_badge('red', '🔴 Market Data: OFFLINE'), unsafe_allow_html=True)
 
         st.markdown("---")
 
         # Navigation menu
         if OPTION_MENU_AVAILABLE:
+            from streamlit_option_menu import option_menu
             selected = option_menu(
                 menu_title=None,
-                options=["Dashboard", "Market Data", "ICT Analysis", "Strategy Editor", "Backtesting", "Risk Management", "Settings"],
+                options=list(PAGES),
                 icons=["speedometer2", "graph-up-arrow", "bullseye", "code-slash", "graph-up", "shield-check", "gear"],
                 menu_icon="cast",
                 default_index=0,
@@ -1504,25 +1778,12 @@ def main():
             st.markdown("### 🧭 NAVIGATION")
             selected = st.selectbox(
                 "Select Page",
-                ["Dashboard", "Market Data", "ICT Analysis", "Strategy Editor", "Backtesting", "Risk Management", "Settings"],
+                list(PAGES),
                 key="navigation"
             )
 
     # Route to selected page
-    if selected == "Dashboard":
-        dashboard_page()
-    elif selected == "Market Data":
-        market_data_page()
-    elif selected == "ICT Analysis":
-        ict_analysis_page()
-    elif selected == "Strategy Editor":
-        strategy_editor_page()
-    elif selected == "Backtesting":
-        backtesting_page()
-    elif selected == "Risk Management":
-        risk_management_page()
-    elif selected == "Settings":
-        settings_page()
+    PAGES.get(selected, dashboard_page)()
 
 if __name__ == "__main__":
     main()
@@ -48,9 +48,8 @@ BLOOMBERG_COLORS = {
     'accent_red': '#cc0000',
 }
 
-def apply_bloomberg_theme():
-    """Apply Bloomberg Terminal styling"""
-    st.markdown(f"""
+# Theme stylesheet and card template are built once at import; the colours are constants
+_THEME_CSS = f"""
     <style>
     .stApp {{
         background-color: {BLOOMBERG_COLORS['bg_primary']};
@@ -84,16 +83,32 @@ def apply_bloomberg_theme():
     .status-green {{ color: {BLOOMBERG_COLORS['accent_green']}; font-weight: bold; }}
     .status-red {{ color: {BLOOMBERG_COLORS['accent_red']}; font-weight: bold; }}
     </style>
-    """, unsafe_allow_html=True)
+    """
 
-def create_metric_card(title, value):
-    """Create Bloomberg-style metric card"""
-    st.markdown(f"""
+_METRIC_TMPL = """
     <div class="metric-card">
         <div style="font-size: 14px; opacity: 0.8;">{title}</div>
         <div style="font-size: 24px; font-weight: bold;">{value}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+_HEADER_TMPL = """
+    <div class="terminal-header">
+        ALGORITHMIC TRADING TERMINAL v1.0 | {now:%Y-%m-%d %H:%M:%S} EST
+    </div>
+    """
+
+def _header_html():
+    """Header with the current timestamp"""
+    return _HEADER_TMPL.format(now=datetime.now())
+
+def apply_bloomberg_theme():
+    """Apply Bloomberg Terminal styling"""
+    st.markdown(_THEME_CSS, unsafe_allow_html=True)
+
+def create_metric_card(title, value):
+    """Create Bloomberg-style metric card"""
+    st.markdown(_METRIC_TMPL.format(title=title, value=value), unsafe_allow_html=True)
 
 def dashboard_page():
     """Main dashboard"""
@@ -130,6 +145,38 @@ def dashboard_page():
         st.markdown(f'<div class="status-green">Data Feed: {yf_status}</div>', unsafe_allow_html=True)
         st.markdown('<div class="status-green">Risk Manager: ACTIVE</div>', unsafe_allow_html=True)
 
+@st.cache_resource(max_entries=512)
+def _ticker(symbol):
+    """Shared yf.Ticker per symbol so its HTTP session is reused across reruns"""
+    return yf.Ticker(symbol)
+
+@st.cache_data(ttl=30, max_entries=256, show_spinner=False)
+def _last_price(symbol):
+    """Latest close for a symbol, or None without data"""
+    hist = _ticker(symbol).history(period='1d')
+    if hist.empty:
+        return None
+    return float(hist['Close'].iloc[-1])
+
+@st.cache_data(ttl=86400, max_entries=256, show_spinner=False)
+def _company_meta(symbol):
+    """(longName, exchange) from the slow .info scrape; stable enough to cache for a day"""
+    info = _ticker(symbol).info
+    return info.get('longName', 'N/A'), info.get('exchange', 'N/A')
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_closes(symbols):
+    """Latest close per symbol from one batched, threaded yf.download call"""
+    df = yf.download(list(symbols), period='1d', group_by='ticker',
+                     threads=True, progress=False)
+    closes = {}
+    for sym in symbols:
+        if sym in df.columns.get_level_values(0):
+            close = df[sym]['Close'].dropna()
+            if not close.empty:
+                closes[sym] = float(close.iloc[-1])
+    return closes
+
 def market_data_page():
     """Enhanced market data page with comprehensive analysis"""
     if not YFINANCE_AVAILABLE:
@@ -157,19 +204,17 @@ def market_data_page():
             if st.button("GET QUOTE"):
                 if symbol:
                     try:
-                        ticker = yf.Ticker(symbol.upper())
-                        info = ticker.info
-                        hist = ticker.history(period='1d')
+                        current_price = _last_price(symbol.upper())
 
-                        if not hist.empty:
-                            current_price = hist['Close'].iloc[-1]
+                        if current_price is not None:
+                            long_name, exchange = _company_meta(symbol.upper())
 
                             st.success(f"""
                             **{symbol.upper()}**
 
                             Current Price: ${current_price:.2f}
-                            Company: {info.get('longName', 'N/A')}
-                            Exchange: {info.get('exchange', 'N/A')}
+                            Company: {long_name}
+                            Exchange: {exchange}
                             """)
                         else:
                             st.error(f"No data found for {symbol}")
@@ -202,23 +247,16 @@ def market_data_page():
         if hasattr(st.session_state, 'quick_symbols'):
             st.markdown("#### QUICK QUOTES")
 
-            for sym in st.session_state.quick_symbols:
-                try:
-                    ticker = yf.Ticker(sym)
-                    hist = ticker.history(period='1d')
-
-                    if not hist.empty:
-                        price = hist['Close'].iloc[-1]
-                        col1, col2 = st.columns([1, 3])
-
-                        with col1:
-                            st.markdown(f"**{sym}**")
+            try:
+                closes = _fetch_closes(tuple(sorted(st.session_state.quick_symbols)))
+            except Exception as e:
+                st.error(f"Error fetching quotes: {e}")
+                closes = {}
 
-                        with col2:
-                            st.markdown(f"${price:.2f}")
-
-                except Exception as e:
-                    st.error(f"Error fetching {sym}: {e}")
+            # One table instead of a column pair and two markdown calls per symbol
+            rows = [(sym, f"${closes[sym]:.2f}") for sym in st.session_state.quick_symbols if sym in closes]
+            if rows:
+                st.dataframe(pd.DataFrame(rows, columns=['Symbol', 'Price']), hide_index=True)
 
 def strategy_page():
     """Strategy editor page"""
@@ -282,6 +320,15 @@ def generate_signals(data):
         if st.button("SAVE STRATEGY"):
             st.success("Strategy saved!")
 
+_NAV_OPTIONS = ("Dashboard", "Market Data", "Strategy Editor")
+_NAV_ICONS = ("speedometer2", "graph-up-arrow", "code-slash")
+
+PAGES = {
+    "Dashboard": dashboard_page,
+    "Market Data": market_data_page,
+    "Strategy Editor": strategy_page,
+}
+
 def main():
     """Main application"""
     st.set_page_config(
@@ -294,34 +341,25 @@ def main():
     apply_bloomberg_theme()
 
     # Header
-    st.markdown(f"""
-    <div class="terminal-header">
-        ALGORITHMIC TRADING TERMINAL v1.0 | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} EST
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_header_html(), unsafe_allow_html=True)
 
     # Navigation
     if OPTION_MENU_AVAILABLE:
         with st.sidebar:
             selected = option_menu(
                 menu_title="TRADING TERMINAL",
-                options=["Dashboard", "Market Data", "Strategy Editor"],
-                icons=["speedometer2", "graph-up-arrow", "code-slash"],
+                options=_NAV_OPTIONS,
+                icons=_NAV_ICONS,
                 default_index=0
             )
     else:
         # Fallback navigation
         with st.sidebar:
             st.markdown("## TRADING TERMINAL")
-            selected = st.selectbox("Navigate", ["Dashboard", "Market Data", "Strategy Editor"])
+            selected = st.selectbox("Navigate", _NAV_OPTIONS)
 
     # Route pages
-    if selected == "Dashboard":
-        dashboard_page()
-    elif selected == "Market Data":
-        market_data_page()
-    elif selected == "Strategy Editor":
-        strategy_page()
+    PAGES.get(selected, dashboard_page)()
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,8 @@ Simple launcher for the Bloomberg UI web application
 """
 import sys
 import os
-import subprocess
+import shutil
+from importlib.util import find_spec
 
 # Add the workspace root to Python path
 workspace_root = os.path.dirname(os.path.abspath(__file__))
@@ -20,21 +21,13 @@ def main():
     env = os.environ.copy()
     env['PYTHONPATH'] = workspace_root
     
-    # Try different streamlit commands
-    streamlit_commands = [
-        ['streamlit', 'run', 'interfaces/bloomberg_ui.py'],
-        ['python3', '-m', 'streamlit', 'run', 'interfaces/bloomberg_ui.py'],
-        ['python', '-m', 'streamlit', 'run', 'interfaces/bloomberg_ui.py']
-    ]
-    
-    for cmd in streamlit_commands:
-        try:
-            print(f"Trying: {' '.join(cmd)}")
-            result = subprocess.run(cmd, env=env, cwd=workspace_root, check=True)
-            break
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            print(f"Failed: {e}")
-            continue
+    # Probe for streamlit once instead of spawning candidate commands in turn
+    app_path = os.path.join(workspace_root, 'interfaces', 'bloomberg_ui.py')
+    exe = shutil.which('streamlit')
+    if exe:
+        cmd = [exe, 'run', app_path]
+    elif find_spec('streamlit') is not None:
+        cmd = [sys.executable, '-m', 'streamlit', 'run', app_path]
     else:
         print("\n❌ Could not launch Streamlit web app.")
         print("\n🔧 Manual launch options:")
@@ -43,7 +36,10 @@ def main():
         print("3. Or use: python -m streamlit run interfaces/bloomberg_ui.py")
         return False
     
-    return True
+    # Replace this process with the server rather than keeping a parent around
+    print(f"Running: {' '.join(cmd)}", flush=True)
+    os.chdir(workspace_root)
+    os.execvpe(cmd[0], cmd, env)
 
 if __name__ == "__main__":
     main()
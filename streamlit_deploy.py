@@ -9,48 +9,20 @@ import sys
 import subprocess
 import json
 from pathlib import Path
-
-def log_info(message):
-    print(f"✅ {message}")
-
-def log_warn(message):
-    print(f"⚠️  {message}")
-
-def log_error(message):
-    print(f"❌ {message}")
-
-def check_git():
-    """Check if git is available and repository is initialized"""
-    try:
-        subprocess.run(['git', '--version'], check=True, capture_output=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
-
-def create_requirements():
-    """Create requirements.txt for Streamlit Cloud"""
-    requirements = [
-        "streamlit>=1.28.0",
-        "pandas>=1.5.0",
-        "numpy>=1.24.0",
-        "plotly>=5.15.0",
-        "yfinance>=0.2.0",
-        "python-dotenv>=1.0.0",
-        "requests>=2.31.0"
-    ]
-    
-    with open('requirements.txt', 'w') as f:
-        f.write('\n'.join(requirements))
-    
-    log_info("Created requirements.txt for Streamlit Cloud")
-
-def create_streamlit_config():
-    """Create Streamlit configuration for cloud deployment"""
-    config_dir = Path('.streamlit')
-    config_dir.mkdir(exist_ok=True)
-    
-    # Create config.toml
-    config_content = """[global]
+from concurrent.futures import ThreadPoolExecutor
+
+# Deployment file payloads; all static, so they are built once at import
+_REQUIREMENTS_TXT = "\n".join([
+    "streamlit>=1.37.0",
+    "pandas>=1.5.0",
+    "numpy>=1.24.0",
+    "plotly>=5.15.0",
+    "yfinance>=0.2.0",
+    "python-dotenv>=1.0.0",
+    "requests>=2.31.0"
+])
+
+_CONFIG_TOML = """[global]
 developmentMode = false
 
 [server]
@@ -67,15 +39,8 @@ backgroundColor = "#000000"
 secondaryBackgroundColor = "#1a1a1a"
 textColor = "#ffffff"
 """
-    
-    with open(config_dir / 'config.toml', 'w') as f:
-        f.write(config_content)
-    
-    log_info("Created Streamlit configuration")
 
-def create_secrets_template():
-    """Create secrets template for Streamlit Cloud"""
-    secrets_content = """# Streamlit Cloud Secrets Template
+_SECRETS_TEMPLATE = """# Streamlit Cloud Secrets Template
 # Copy this to your Streamlit Cloud app settings
 
 [general]
@@ -92,15 +57,8 @@ environment = "production"
 # alpha_vantage = "your-api-key"
 # polygon = "your-api-key"
 """
-    
-    with open('.streamlit/secrets.toml.template', 'w') as f:
-        f.write(secrets_content)
-    
-    log_info("Created secrets template")
 
-def create_gitignore():
-    """Create .gitignore file"""
-    gitignore_content = """# Python
+_GITIGNORE = """# Python
 __pycache__/
 *.py[cod]
 *$py.class
@@ -156,15 +114,8 @@ data/*.db
 # SSL certificates
 ssl/
 """
-    
-    with open('.gitignore', 'w') as f:
-        f.write(gitignore_content)
-    
-    log_info("Created .gitignore file")
 
-def create_readme():
-    """Create deployment README"""
-    readme_content = """# ICT Trading System - Live Deployment
+_README_DEPLOYMENT = """# ICT Trading System - Live Deployment
 
 ## Quick Deploy to Streamlit Cloud
 
@@ -224,10 +175,53 @@ For deployment issues, check:
 - Enable HTTPS in production
 - Consider adding authentication for public deployments
 """
-    
-    with open('README_DEPLOYMENT.md', 'w') as f:
-        f.write(readme_content)
-    
+
+def log_info(message):
+    print(f"✅ {message}")
+
+def log_warn(message):
+    print(f"⚠️  {message}")
+
+def log_error(message):
+    print(f"❌ {message}")
+
+def check_git():
+    """Check if git is available and repository is initialized"""
+    try:
+        subprocess.run(['git', '--version'], check=True, capture_output=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+def _write(target, payload):
+    """Write a payload as UTF-8 bytes, creating the parent directory if needed"""
+    path = Path(target)
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(payload.encode())
+
+def create_requirements():
+    """Create requirements.txt for Streamlit Cloud"""
+    _write('requirements.txt', _REQUIREMENTS_TXT)
+    log_info("Created requirements.txt for Streamlit Cloud")
+
+def create_streamlit_config():
+    """Create Streamlit configuration for cloud deployment"""
+    _write('.streamlit/config.toml', _CONFIG_TOML)
+    log_info("Created Streamlit configuration")
+
+def create_secrets_template():
+    """Create secrets template for Streamlit Cloud"""
+    _write('.streamlit/secrets.toml.template', _SECRETS_TEMPLATE)
+    log_info("Created secrets template")
+
+def create_gitignore():
+    """Create .gitignore file"""
+    _write('.gitignore', _GITIGNORE)
+    log_info("Created .gitignore file")
+
+def create_readme():
+    """Create deployment README"""
+    _write('README_DEPLOYMENT.md', _README_DEPLOYMENT)
     log_info("Created deployment README")
 
 def init_git_repo():
@@ -279,12 +273,12 @@ def main():
         log_error("Git is not installed. Please install Git first.")
         sys.exit(1)
     
-    # Create deployment files
-    create_requirements()
-    create_streamlit_config()
-    create_secrets_template()
-    create_gitignore()
-    create_readme()
+    # Create deployment files; they are independent, so write them concurrently
+    writers = [create_requirements, create_streamlit_config, create_secrets_template,
+               create_gitignore, create_readme]
+    with ThreadPoolExecutor(max_workers=len(writers)) as pool:
+        for future in [pool.submit(writer) for writer in writers]:
+            future.result()
     
     # Initialize git repository
     if init_git_repo():
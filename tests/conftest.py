@@ -0,0 +1,24 @@
+"""
+Shared pytest configuration for the test suite
+"""
+import logging
+import logging.handlers
+import pytest
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+@pytest.fixture(autouse=True, scope='session')
+def configure_logging():
+    """Configure logging once per session; records are buffered and written in chunks"""
+    # pytest's capture handlers already sit on the root logger, which makes
+    # basicConfig a no-op here, so the handler is attached explicitly
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+    buffered = logging.handlers.MemoryHandler(capacity=1000, target=stream)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(buffered)
+    yield
+    root.removeHandler(buffered)
+    buffered.close()
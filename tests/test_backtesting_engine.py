@@ -0,0 +1,134 @@
+"""
+Test BacktestEngine indicator preparation
+Covers the on-disk Parquet indicator cache and parity with per-bar indicator recomputation
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pandas_ta')
+pytest.importorskip('pyarrow')
+
+from trading_core import backtesting_engine
+from trading_core.backtesting_engine import BacktestEngine
+from trading_core.risk_manager import RiskManager
+from trading_core.strategy_framework import BaseStrategy, CustomStrategy
+
+def _ohlcv_frame(seed, periods=200):
+    """Seeded daily OHLCV random walk"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2023-01-01', periods=periods, freq='D', tz='America/New_York')
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    spread = rng.uniform(0.1, 1.5, periods)
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.5, periods),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, periods)
+    }, index=index)
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the indicator cache at a throwaway directory"""
+    path = str(tmp_path / 'indicators')
+    monkeypatch.setattr(backtesting_engine, 'INDICATOR_CACHE_DIR', path)
+    return path
+
+def _cache_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith('.parquet'))
+
+def test_cache_hit_matches_recomputation(cache_dir):
+    """Indicators read back from the cache equal a fresh prepare_data run"""
+    engine = BacktestEngine()
+    strategy = CustomStrategy(None)
+    data = {'ES': _ohlcv_frame(0)}
+
+    first = engine._prepare_data(strategy, data)
+    assert len(_cache_files(cache_dir)) == 1
+
+    cached = engine._prepare_data(strategy, data)
+    fresh = strategy.prepare_data(data)
+
+    pd.testing.assert_frame_equal(first['ES'], fresh['ES'])
+    # Parquet does not store the index freq, which nothing downstream reads
+    pd.testing.assert_frame_equal(cached['ES'], fresh['ES'], check_freq=False)
+
+def test_cache_keeps_newest_files(cache_dir, monkeypatch):
+    """Writing past INDICATOR_CACHE_MAX_FILES evicts the least recently used files"""
+    monkeypatch.setattr(backtesting_engine, 'INDICATOR_CACHE_MAX_FILES', 2)
+    engine = BacktestEngine()
+    strategy = CustomStrategy(None)
+    frames = [_ohlcv_frame(seed) for seed in range(3)]
+    paths = [engine._indicator_cache_path(strategy, df) for df in frames]
+
+    for age, df in enumerate(frames):
+        engine._prepare_data(strategy, {'ES': df})
+        # Spread the modification times so eviction order does not depend on timer resolution
+        os.utime(paths[age], (1_000_000 + age, 1_000_000 + age))
+
+    assert _cache_files(cache_dir) == sorted(os.path.basename(path) for path in paths[1:])
+
+class _PerWindowStrategy(BaseStrategy):
+    """The previous engine path: indicators recomputed on every bar's window"""
+
+    def __init__(self, strategy):
+        super().__init__(strategy.name, None)
+        self.strategy = strategy
+
+    def prepare_data(self, data):
+        return data
+
+    def execute_prepared(self, prepared_data):
+        return self.strategy.execute_strategy(prepared_data)
+
+    def generate_signals(self, data):
+        return self.strategy.generate_signals(data)
+
+    def calculate_entry_exit(self, symbol, data, signal):
+        prepared = self.strategy.prepare_data({symbol: data})
+        return self.strategy.calculate_entry_exit(symbol, prepared[symbol], signal)
+
+class _MacdCrossStrategy(BaseStrategy):
+    """Trades MACD crossovers from the engine's first eligible bar, inside the MACD warm-up"""
+
+    def __init__(self):
+        super().__init__("MacdCross", None)
+
+    def generate_signals(self, data):
+        signals = []
+        for symbol, df in data.items():
+            latest = df.iloc[-1]
+            if latest['macd_bullish'] or latest['macd_bearish']:
+                signals.append({
+                    'symbol': symbol,
+                    'direction': 'LONG' if latest['macd_bullish'] else 'SHORT',
+                    'confidence': 1.0,
+                    'timestamp': latest.name
+                })
+        return signals
+
+    def calculate_entry_exit(self, symbol, data, signal):
+        latest = data.iloc[-1]
+        offset = 2 * latest['atr'] if signal['direction'] == 'LONG' else -2 * latest['atr']
+        return latest['close'], latest['close'] - offset, latest['close'] + offset
+
+_TRADE_FIELDS = ['symbol', 'direction', 'size', 'entry_price', 'exit_price', 'realized_pnl', 'exit_reason']
+
+@pytest.mark.parametrize('strategy', [
+    CustomStrategy(None, min_confidence=0.4),
+    _MacdCrossStrategy()
+], ids=['custom', 'macd-cross'])
+def test_full_history_matches_per_window_trades(cache_dir, strategy):
+    """Indicators prepared once over the full history trade exactly like per-bar recomputation"""
+    data = {'ES': _ohlcv_frame(1, periods=150), 'NQ': _ohlcv_frame(2, periods=150)}
+
+    full = BacktestEngine()._simulate_trading(strategy, RiskManager(100000), data, '1d')
+    windowed = BacktestEngine()._simulate_trading(_PerWindowStrategy(strategy), RiskManager(100000), data, '1d')
+
+    trades = [[trade[field] for field in _TRADE_FIELDS] for trade in full['trade_log']]
+    assert trades, "seeded data should produce at least one trade"
+    assert trades == [[trade[field] for field in _TRADE_FIELDS] for trade in windowed['trade_log']]
+    pd.testing.assert_frame_equal(full['equity_history'], windowed['equity_history'])
@@ -0,0 +1,105 @@
+"""
+Test DataManager price storage
+Covers the SQLite upsert path and the migration of keyless price tables
+"""
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.config import trading_config
+from trading_core.data_manager import DataManager
+
+def _price_frame(start, periods=5, scale=1.0, tz='America/New_York'):
+    """Small daily OHLCV frame shaped like a cleaned yfinance download"""
+    index = pd.date_range(start, periods=periods, freq='D', tz=tz)
+    prices = np.linspace(100.0, 104.0, periods) * scale
+    return pd.DataFrame({
+        'open': prices,
+        'high': prices + 1,
+        'low': prices - 1,
+        'close': prices,
+        'volume': np.arange(periods, dtype=np.int64) * 10
+    }, index=index)
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point DataManager at a throwaway database"""
+    path = str(tmp_path / 'trading_data.db')
+    monkeypatch.setattr(trading_config, 'DATABASE_PATH', path)
+    return path
+
+def _row_counts(db_path):
+    """Total rows and distinct (symbol, timestamp, timeframe) keys in price_data"""
+    with closing(sqlite3.connect(db_path)) as conn:
+        return conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT symbol || timestamp || timeframe) FROM price_data"
+        ).fetchone()
+
+def test_store_keeps_other_symbols(db_path):
+    """Storing ES, NQ, then ES again keeps both symbols without duplicate rows"""
+    with DataManager() as dm:
+        dm._store_price_data('ES', _price_frame('2024-01-01'), '1d')
+        dm._store_price_data('NQ', _price_frame('2024-01-01', scale=2.0), '1d')
+        dm._store_price_data('ES', _price_frame('2024-01-01', scale=3.0), '1d')
+
+        es = dm.get_stored_data('ES', '1d')
+        nq = dm.get_stored_data('NQ', '1d')
+
+        assert len(es) == 5
+        assert len(nq) == 5
+        assert es['close'].tolist() == (np.linspace(100.0, 104.0, 5) * 3.0).tolist()
+        assert nq['close'].tolist() == (np.linspace(100.0, 104.0, 5) * 2.0).tolist()
+
+    total, distinct = _row_counts(db_path)
+    assert total == distinct == 10
+
+@pytest.mark.parametrize('tz', [None, 'America/New_York'], ids=['naive', 'tz-aware'])
+def test_migrates_keyless_price_table(db_path, tz):
+    """A price_data table rebuilt by to_sql gets its key back, keeping the latest row per key"""
+    old = _price_frame('2024-01-01', tz=tz)
+    newer = _price_frame('2024-01-01', scale=3.0, tz=tz)
+    columns = ['symbol', 'timestamp', 'timeframe', 'open', 'high', 'low', 'close', 'volume']
+
+    # What the old to_sql(if_exists='replace') path left behind: datetime
+    # timestamps in to_sql's own text format, no key, duplicate rows
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        for frame in (old, newer):
+            rows = frame.copy()
+            rows['symbol'] = 'ES'
+            rows['timeframe'] = '1d'
+            rows['timestamp'] = rows.index
+            rows[columns].to_sql('price_data', conn, if_exists='append', index=False)
+
+    with DataManager() as dm:
+        with closing(sqlite3.connect(db_path)) as conn:
+            key = [column[1] for column in conn.execute("PRAGMA table_info(price_data)") if column[5]]
+        assert key == ['symbol', 'timestamp', 'timeframe']
+
+        total, distinct = _row_counts(db_path)
+        assert total == distinct == 5
+        assert dm.get_stored_data('ES', '1d')['close'].tolist() == newer['close'].tolist()
+
+        # Upserts of the same dates now replace the migrated rows instead of appending
+        dm._store_price_data('ES', old, '1d')
+        assert _row_counts(db_path) == (5, 5)
+
+        stored = dm.get_stored_data('ES', '1d')
+        assert len(stored) == 5
+        assert stored['close'].tolist() == old['close'].tolist()
+        # Stored as UTC; naive indexes are taken as UTC
+        expected = old.index if tz else old.index.tz_localize('UTC')
+        assert (stored.index == expected).all()
+
+def test_close_releases_database(db_path):
+    """Leaving the context closes the shared connection and checkpoints the WAL"""
+    with DataManager() as dm:
+        dm._store_price_data('ES', _price_frame('2024-01-01'), '1d')
+        assert os.path.exists(db_path + '-wal')
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        dm._conn.execute("SELECT 1")
+    assert not os.path.exists(db_path + '-wal')
@@ -5,6 +5,8 @@ Demonstrates the integration of PO3, Goldbach, AMD, and HIPPO analysis
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 from trading_core.trading_system import TradingSystem
@@ -14,51 +16,46 @@ from ict_strategy.ict_goldbach import GoldbachLevels
 from ict_strategy.ict_amd_cycles import AMDCycles
 from ict_strategy.ict_hippo import HIPPOPatterns
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Logging is configured by conftest.py under pytest, or in __main__ below
 logger = logging.getLogger(__name__)
 
+# Seed for the sample data; each build starts its own generator from it
+_SEED = 42
+
 def create_sample_forex_data(days: int = 100) -> pd.DataFrame:
     """Create sample forex data for testing"""
+    # Deep copy so a test mutating its frame can't poison the cache
+    return _build_sample_forex_data(days).copy()
+
+@lru_cache(maxsize=8)
+def _build_sample_forex_data(days: int) -> pd.DataFrame:
+    """Seeded, deterministic sample data; built once per days value"""
     
-    # Generate realistic forex price data
-    np.random.seed(42)
+    # Generate realistic forex price data from one seeded generator
+    rng = np.random.default_rng(_SEED)
     
     # Start with base price
     base_price = 1.0850  # EURUSD example
     
-    # Generate dates
-    dates = pd.date_range(start=datetime.now() - timedelta(days=days), 
-                         periods=days*24, freq='H')  # Hourly data
-    
     # Generate price movements
-    returns = np.random.normal(0, 0.0002, len(dates))  # Small hourly returns
-    prices = [base_price]
-    
-    for ret in returns[1:]:
-        new_price = prices[-1] * (1 + ret)
-        prices.append(new_price)
-    
-    # Create OHLC data
-    data = []
-    for i in range(0, len(prices)-4, 4):  # Group into 4-hour candles
-        if i+4 < len(prices):
-            open_price = prices[i]
-            high_price = max(prices[i:i+4])
-            low_price = min(prices[i:i+4])
-            close_price = prices[i+3]
-            
-            data.append({
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': close_price,
-                'volume': np.random.randint(1000, 10000)
-            })
-    
-    df = pd.DataFrame(data)
-    df.index = pd.date_range(start=datetime.now() - timedelta(days=days), 
-                            periods=len(df), freq='4H')
+    n_hours = days * 24  # Hourly data
+    returns = rng.normal(0, 0.0002, n_hours)  # Small hourly returns
+    returns[0] = 0.0
+    prices = base_price * np.cumprod(1 + returns)
+    
+    # Group into 4-hour candles (the trailing partial block is dropped); reduceat
+    # works off candle start offsets, so uneven groupings only need new starts
+    n_candles = (len(prices) - 1) // 4
+    starts = np.arange(0, n_candles * 4, 4)
+    ends = starts + 4
+    df = pd.DataFrame({
+        'open': prices[starts],
+        'high': np.maximum.reduceat(prices[:ends[-1]], starts),
+        'low': np.minimum.reduceat(prices[:ends[-1]], starts),
+        'close': prices[ends - 1],
+        'volume': rng.integers(1000, 10000, size=n_candles, dtype=np.int32)
+    }, index=pd.date_range(start=datetime.now() - timedelta(days=days),
+                           periods=n_candles, freq='4h'))
     
     return df
 
@@ -68,22 +65,22 @@ def test_po3_analysis():
     
     # Create sample data
     data = create_sample_forex_data(30)
-    current_price = data['close'].iloc[-1]
+    current_price = data['close'].iat[-1]
     
     # Initialize PO3
     po3 = PowerOfThree()
     
     # Test optimal PO3 size calculation
     optimal_size = po3.get_optimal_po3_size(data)
-    logger.info(f"Optimal PO3 size: {optimal_size}")
+    logger.info("Optimal PO3 size: %s", optimal_size)
     
     # Test dealing range calculation
     dealing_range = po3.calculate_dealing_range(current_price, optimal_size, 'forex')
-    logger.info(f"Current dealing range: {dealing_range}")
+    logger.info("Current dealing range: %s", dealing_range)
     
     # Test stop run identification
     stop_runs = po3.identify_po3_stop_runs(data, optimal_size)
-    logger.info(f"Found {len(stop_runs)} PO3 stop runs")
+    logger.info("Found %s PO3 stop runs", len(stop_runs))
     
     return dealing_range
 
@@ -101,12 +98,12 @@ def test_goldbach_analysis(po3_range):
     
     logger.info("Goldbach levels calculated:")
     for level_type, level_data in levels.items():
-        logger.info(f"  {level_type}: {level_data}")
+        logger.info("  %s: %s", level_type, level_data)
     
     # Test institutional levels
     data = create_sample_forex_data(30)
     institutional_levels = goldbach.calculate_institutional_levels(data, po3_range)
-    logger.info(f"Institutional levels: {institutional_levels}")
+    logger.info("Institutional levels: %s", institutional_levels)
     
     return levels
 
@@ -124,17 +121,17 @@ def test_amd_analysis():
     target_date = data.index[-1].date()
     amd_cycle = amd.identify_daily_amd_cycle(data, target_date)
     
-    logger.info(f"AMD cycle for {target_date}:")
+    logger.info("AMD cycle for %s:", target_date)
     for phase, phase_data in amd_cycle.items():
         if isinstance(phase_data, dict) and 'start' in phase_data:
-            logger.info(f"  {phase}: {phase_data['start']} to {phase_data['end']}")
+            logger.info("  %s: %s to %s", phase, phase_data['start'], phase_data['end'])
     
     # Test manipulation analysis
     if 'manipulation' in amd_cycle and not amd_cycle['manipulation']['data'].empty:
         manipulation_analysis = amd.analyze_manipulation_phase(
             amd_cycle['manipulation']['data']
         )
-        logger.info(f"Manipulation analysis: {manipulation_analysis}")
+        logger.info("Manipulation analysis: %s", manipulation_analysis)
     
     return amd_cycle
 
@@ -150,18 +147,18 @@ def test_hippo_analysis():
     
     # Test current partition
     partition_info = hippo.get_current_lookback_partition()
-    logger.info(f"Current lookback partition: {partition_info}")
+    logger.info("Current lookback partition: %s", partition_info)
     
     # Test HIPPO pattern identification
     patterns = hippo.identify_hippo_patterns(data)
-    logger.info(f"Found {len(patterns)} HIPPO patterns")
+    logger.info("Found %s HIPPO patterns", len(patterns))
     
     for i, pattern in enumerate(patterns[:3]):  # Show first 3 patterns
-        logger.info(f"  Pattern {i+1}: {pattern}")
+        logger.info("  Pattern %s: %s", i+1, pattern)
     
     # Test lookback clues
     clues = hippo.analyze_lookback_clues(data, partition_info)
-    logger.info(f"Found {len(clues)} lookback clues")
+    logger.info("Found %s lookback clues", len(clues))
     
     return patterns
 
@@ -187,43 +184,40 @@ def test_integrated_ict_strategy():
     analysis = ict_strategy.analyze_market(data)
     
     logger.info("ICT Market Analysis Results:")
-    logger.info(f"  Current Price: {analysis.get('current_price', 'N/A')}")
+    logger.info("  Current Price: %s", analysis.get('current_price', 'N/A'))
     
     # PO3 Analysis
     po3_analysis = analysis.get('po3_analysis', {})
     if po3_analysis:
-        logger.info(f"  PO3 Optimal Size: {po3_analysis.get('optimal_size', 'N/A')}")
+        logger.info("  PO3 Optimal Size: %s", po3_analysis.get('optimal_size', 'N/A'))
         price_position = po3_analysis.get('price_position', {})
-        logger.info(f"  Price Position: {price_position.get('zone', 'N/A')} "
-                   f"(strength: {price_position.get('strength', 0):.2f})")
+        logger.info("  Price Position: %s (strength: %.2f)", price_position.get('zone', 'N/A'), price_position.get('strength', 0))
     
     # Goldbach Analysis
     goldbach_analysis = analysis.get('goldbach_analysis', {})
     nearest_level = goldbach_analysis.get('nearest_level')
     if nearest_level:
-        logger.info(f"  Nearest Goldbach Level: {nearest_level.get('level_type', 'N/A')} "
-                   f"at {nearest_level.get('price', 'N/A')}")
+        logger.info("  Nearest Goldbach Level: %s at %s", nearest_level.get('level_type', 'N/A'), nearest_level.get('price', 'N/A'))
     
     # AMD Analysis
     amd_analysis = analysis.get('amd_analysis', {})
     current_phase = amd_analysis.get('current_phase')
     if current_phase:
-        logger.info(f"  Current AMD Phase: {current_phase}")
+        logger.info("  Current AMD Phase: %s", current_phase)
     
     # HIPPO Analysis
     hippo_analysis = analysis.get('hippo_analysis', {})
     patterns = hippo_analysis.get('patterns', [])
-    logger.info(f"  HIPPO Patterns Found: {len(patterns)}")
+    logger.info("  HIPPO Patterns Found: %s", len(patterns))
     
     # Test signal generation
     signals = ict_strategy.generate_signals(data)
-    logger.info(f"Generated {len(signals)} trading signals:")
+    logger.info("Generated %s trading signals:", len(signals))
     
     for i, signal in enumerate(signals):
-        logger.info(f"  Signal {i+1}: {signal.get('type', 'N/A')} - "
-                   f"{signal.get('direction', 'N/A')} "
-                   f"(strength: {signal.get('strength', 0):.2f}, "
-                   f"confluence: {signal.get('confluence_score', 0):.2f})")
+        logger.info("  Signal %s: %s - %s (strength: %.2f, confluence: %.2f)", i+1,
+                   signal.get('type', 'N/A'), signal.get('direction', 'N/A'),
+                   signal.get('strength', 0), signal.get('confluence_score', 0))
     
     return analysis, signals
 
@@ -234,22 +228,22 @@ def test_trading_system_with_ict():
     # Initialize trading system with ICT strategy
     system = TradingSystem(initial_capital=100000, strategy_name="ict")
     
-    logger.info(f"Trading system initialized with strategy: {system.strategy.__class__.__name__}")
+    logger.info("Trading system initialized with strategy: %s", system.strategy.__class__.__name__)
     
     # Test getting current signals (this will use sample data since we don't have live data)
     try:
         signals = system.get_current_signals()
-        logger.info(f"Current signals from trading system: {len(signals)}")
+        logger.info("Current signals from trading system: %s", len(signals))
         
         for signal in signals:
-            logger.info(f"  {signal}")
+            logger.info("  %s", signal)
             
     except Exception as e:
-        logger.warning(f"Could not get live signals (expected in test environment): {e}")
+        logger.warning("Could not get live signals (expected in test environment): %s", e)
     
     # Test performance report
     report = system.get_performance_report()
-    logger.info(f"Performance report: {report}")
+    logger.info("Performance report: %s", report)
 
 def main():
     """Run all ICT strategy tests"""
@@ -261,10 +255,16 @@ def main():
         logger.info("\n1. Testing Individual Components:")
         logger.info("-" * 40)
         
-        po3_range = test_po3_analysis()
-        goldbach_levels = test_goldbach_analysis(po3_range)
-        amd_cycle = test_amd_analysis()
-        hippo_patterns = test_hippo_analysis()
+        # PO3, AMD and HIPPO are independent; only Goldbach needs the PO3 range
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            f_po3 = ex.submit(test_po3_analysis)
+            f_amd = ex.submit(test_amd_analysis)
+            f_hippo = ex.submit(test_hippo_analysis)
+            
+            po3_range = f_po3.result()
+            goldbach_levels = test_goldbach_analysis(po3_range)
+            amd_cycle = f_amd.result()
+            hippo_patterns = f_hippo.result()
         
         # Test integrated strategy
         logger.info("\n2. Testing Integrated ICT Strategy:")
@@ -283,16 +283,17 @@ def main():
         
         # Summary
         logger.info("\nSUMMARY:")
-        logger.info(f"✓ PO3 Analysis: Range calculated successfully")
-        logger.info(f"✓ Goldbach Levels: {len(goldbach_levels)} level types identified")
-        logger.info(f"✓ AMD Cycles: Daily cycle analysis completed")
-        logger.info(f"✓ HIPPO Patterns: {len(hippo_patterns)} patterns found")
-        logger.info(f"✓ Integrated Strategy: {len(signals)} signals generated")
-        logger.info(f"✓ Trading System: ICT strategy integrated successfully")
+        logger.info("✓ PO3 Analysis: Range calculated successfully")
+        logger.info("✓ Goldbach Levels: %s level types identified", len(goldbach_levels))
+        logger.info("✓ AMD Cycles: Daily cycle analysis completed")
+        logger.info("✓ HIPPO Patterns: %s patterns found", len(hippo_patterns))
+        logger.info("✓ Integrated Strategy: %s signals generated", len(signals))
+        logger.info("✓ Trading System: ICT strategy integrated successfully")
         
     except Exception as e:
-        logger.error(f"Test failed with error: {e}")
+        logger.error("Test failed with error: %s", e)
         raise
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
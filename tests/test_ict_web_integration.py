@@ -5,34 +5,51 @@ Tests the ICT analysis functionality that would be used in the web interface
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Logging is configured by conftest.py under pytest, or in __main__ below
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=32)
+def _fetch(symbol, period, interval):
+    """Price history with lower-cased columns, fetched once per (symbol, period, interval)"""
+    import yfinance as yf
+    data = yf.Ticker(symbol).history(period=period, interval=interval)
+    data.columns = data.columns.str.lower()
+    return data
+
+# Shared ICT settings; every web test exercises the same day-trading forex setup
+ICT_CONFIG = {
+    'trading_style': 'day_trading',
+    'asset_type': 'forex',
+    'risk_per_trade': 0.02,
+    'max_daily_trades': 3,
+    'confluence_threshold': 0.6
+}
+
+@lru_cache(maxsize=4)
+def _strategy(config=tuple(ICT_CONFIG.items())):
+    """One StandaloneICTStrategy per frozen (key, value) config, shared by tests that use it"""
+    from ict_strategy.standalone_ict_strategy import StandaloneICTStrategy
+    return StandaloneICTStrategy(dict(config))
+
 def test_yfinance_integration():
     """Test yfinance data fetching"""
     logger.info("Testing yfinance integration...")
     
     try:
-        import yfinance as yf
-        
-        # Test fetching EURUSD data
+        # Test fetching EURUSD data; a deep copy keeps the cached frame intact
         symbol = "EURUSD=X"
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period="30d", interval="4h")
+        data = _fetch(symbol, "30d", "4h").copy()
         
         if data.empty:
-            logger.error(f"No data received for {symbol}")
+            logger.error("No data received for %s", symbol)
             return False
         
-        # Convert column names to lowercase
-        data.columns = [col.lower() for col in data.columns]
-        
-        logger.info(f"✅ Successfully fetched {len(data)} data points for {symbol}")
-        logger.info(f"   Date range: {data.index[0]} to {data.index[-1]}")
-        logger.info(f"   Current price: {data['close'].iloc[-1]:.5f}")
+        logger.info("✅ Successfully fetched %s data points for %s", len(data), symbol)
+        logger.info("   Date range: %s to %s", data.index[0], data.index[-1])
+        logger.info("   Current price: %.5f", data['close'].iat[-1])
         
         return True, data
         
@@ -40,7 +57,7 @@ def test_yfinance_integration():
         logger.error("❌ yfinance not available")
         return False, None
     except Exception as e:
-        logger.error(f"❌ Error fetching data: {e}")
+        logger.error("❌ Error fetching data: %s", e)
         return False, None
 
 def test_ict_analysis_with_real_data():
@@ -48,8 +65,6 @@ def test_ict_analysis_with_real_data():
     logger.info("Testing ICT analysis with real market data...")
     
     try:
-        from ict_strategy.standalone_ict_strategy import StandaloneICTStrategy
-        
         # Get real data
         success, data = test_yfinance_integration()
         if not success or data is None:
@@ -57,15 +72,7 @@ def test_ict_analysis_with_real_data():
             return False
         
         # Initialize ICT strategy
-        config = {
-            'trading_style': 'day_trading',
-            'asset_type': 'forex',
-            'risk_per_trade': 0.02,
-            'max_daily_trades': 3,
-            'confluence_threshold': 0.6
-        }
-        
-        strategy = StandaloneICTStrategy(config)
+        strategy = _strategy()
         
         # Perform analysis
         logger.info("Running ICT analysis...")
@@ -79,7 +86,7 @@ def test_ict_analysis_with_real_data():
         logger.info("✅ ICT Analysis Results:")
         
         current_price = analysis['current_price']
-        logger.info(f"   Current Price: {current_price:.5f}")
+        logger.info("   Current Price: %.5f", current_price)
         
         # PO3 Analysis
         po3_analysis = analysis.get('po3_analysis', {})
@@ -87,10 +94,10 @@ def test_ict_analysis_with_real_data():
             dealing_range = po3_analysis.get('dealing_range', {})
             price_position = po3_analysis.get('price_position', {})
             
-            logger.info(f"   PO3 Optimal Size: {po3_analysis.get('optimal_size')}")
-            logger.info(f"   Dealing Range: {dealing_range.get('range_low', 0):.5f} - {dealing_range.get('range_high', 0):.5f}")
-            logger.info(f"   Price Zone: {price_position.get('zone', 'unknown').upper()}")
-            logger.info(f"   Zone Strength: {price_position.get('strength', 0):.2f}")
+            logger.info("   PO3 Optimal Size: %s", po3_analysis.get('optimal_size'))
+            logger.info("   Dealing Range: %.5f - %.5f", dealing_range.get('range_low', 0), dealing_range.get('range_high', 0))
+            logger.info("   Price Zone: %s", price_position.get('zone', 'unknown').upper())
+            logger.info("   Zone Strength: %.2f", price_position.get('strength', 0))
         
         # Goldbach Analysis
         goldbach_analysis = analysis.get('goldbach_analysis', {})
@@ -98,44 +105,44 @@ def test_ict_analysis_with_real_data():
             nearest_level = goldbach_analysis.get('nearest_level')
             if nearest_level:
                 distance_pips = nearest_level.get('distance', 0) * 10000
-                logger.info(f"   Nearest Goldbach Level: {nearest_level.get('level_type')} at {nearest_level.get('price', 0):.5f}")
-                logger.info(f"   Distance: {distance_pips:.1f} pips")
+                logger.info("   Nearest Goldbach Level: %s at %.5f", nearest_level.get('level_type'), nearest_level.get('price', 0))
+                logger.info("   Distance: %.1f pips", distance_pips)
         
         # AMD Analysis
         amd_analysis = analysis.get('amd_analysis', {})
         current_phase = amd_analysis.get('current_phase', 'unknown')
-        logger.info(f"   Current AMD Phase: {current_phase.upper()}")
+        logger.info("   Current AMD Phase: %s", current_phase.upper())
         
         # HIPPO Analysis
         hippo_analysis = analysis.get('hippo_analysis', {})
         partition_info = hippo_analysis.get('partition_info', {})
         patterns = hippo_analysis.get('patterns', [])
         
-        logger.info(f"   Lookback Partition: {partition_info.get('partition_number', 'N/A')}")
-        logger.info(f"   HIPPO Patterns: {len(patterns)}")
+        logger.info("   Lookback Partition: %s", partition_info.get('partition_number', 'N/A'))
+        logger.info("   HIPPO Patterns: %s", len(patterns))
         
         # Generate signals
         logger.info("Generating trading signals...")
         signals = strategy.generate_signals(data)
         
-        logger.info(f"✅ Generated {len(signals)} trading signals:")
+        logger.info("✅ Generated %s trading signals:", len(signals))
         for i, signal in enumerate(signals, 1):
-            logger.info(f"   Signal {i}: {signal.get('type')} - {signal.get('direction').upper()}")
-            logger.info(f"     Entry: {signal.get('entry_price', current_price):.5f}")
-            logger.info(f"     Confluence: {signal.get('confluence_score', 0):.2f}")
+            logger.info("   Signal %s: %s - %s", i, signal.get('type'), signal.get('direction').upper())
+            logger.info("     Entry: %.5f", signal.get('entry_price', current_price))
+            logger.info("     Confluence: %.2f", signal.get('confluence_score', 0))
         
         # Generate trading plan
         trading_plan = strategy.get_trading_plan(data)
         recommendations = trading_plan.get('recommendations', [])
         
-        logger.info(f"✅ Trading Plan Generated:")
+        logger.info("✅ Trading Plan Generated:")
         for i, rec in enumerate(recommendations, 1):
-            logger.info(f"   {i}. {rec}")
+            logger.info("   %s. %s", i, rec)
         
         return True
         
     except Exception as e:
-        logger.error(f"❌ ICT analysis test failed: {e}")
+        logger.error("❌ ICT analysis test failed: %s", e)
         return False
 
 def test_web_interface_components():
@@ -148,13 +155,7 @@ def test_web_interface_components():
         if not success:
             return False
         
-        from ict_strategy.standalone_ict_strategy import StandaloneICTStrategy
-        
-        strategy = StandaloneICTStrategy({
-            'trading_style': 'day_trading',
-            'asset_type': 'forex',
-            'confluence_threshold': 0.6
-        })
+        strategy = _strategy()
         
         analysis = strategy.analyze_market(data)
         signals = strategy.generate_signals(data)
@@ -179,16 +180,16 @@ def test_web_interface_components():
         
         logger.info("✅ Web interface data structure:")
         for key, value in web_data.items():
-            logger.info(f"   {key}: {value}")
+            logger.info("   %s: %s", key, value)
         
-        # Test chart data preparation
+        # Test chart data preparation; column arrays instead of boxed Python lists
         chart_data = {
-            'dates': data.index.tolist(),
+            'dates': data.index.to_numpy(),
             'ohlc': {
-                'open': data['open'].tolist(),
-                'high': data['high'].tolist(),
-                'low': data['low'].tolist(),
-                'close': data['close'].tolist()
+                'open': data['open'].to_numpy(),
+                'high': data['high'].to_numpy(),
+                'low': data['low'].to_numpy(),
+                'close': data['close'].to_numpy()
             },
             'levels': {}
         }
@@ -209,12 +210,12 @@ def test_web_interface_components():
             institutional_levels = goldbach_analysis.get('institutional_levels', {})
             chart_data['levels']['goldbach'] = institutional_levels
         
-        logger.info(f"✅ Chart data prepared: {len(chart_data['dates'])} points, {len(chart_data['levels'])} level groups")
+        logger.info("✅ Chart data prepared: %s points, %s level groups", len(chart_data['dates']), len(chart_data['levels']))
         
         return True
         
     except Exception as e:
-        logger.error(f"❌ Web interface test failed: {e}")
+        logger.error("❌ Web interface test failed: %s", e)
         return False
 
 def simulate_web_workflow():
@@ -233,27 +234,22 @@ def simulate_web_workflow():
             'max_trades': 3
         }
         
-        logger.info(f"Step 1: User configuration: {user_config}")
+        logger.info("Step 1: User configuration: %s", user_config)
         
         # Step 2: Fetch market data
         logger.info("Step 2: Fetching market data...")
-        import yfinance as yf
-        ticker = yf.Ticker(user_config['symbol'])
-        data = ticker.history(period=user_config['period'], interval=user_config['timeframe'])
-        data.columns = [col.lower() for col in data.columns]
+        data = _fetch(user_config['symbol'], user_config['period'], user_config['timeframe']).copy()
         
-        logger.info(f"   ✅ Data fetched: {len(data)} candles")
+        logger.info("   ✅ Data fetched: %s candles", len(data))
         
         # Step 3: Initialize ICT strategy
         logger.info("Step 3: Initializing ICT strategy...")
-        from ict_strategy.standalone_ict_strategy import StandaloneICTStrategy
-        
-        strategy = StandaloneICTStrategy({
-            'trading_style': user_config['trading_style'],
-            'asset_type': user_config['asset_type'],
-            'confluence_threshold': user_config['confluence_threshold'],
-            'max_daily_trades': user_config['max_trades']
-        })
+        strategy = _strategy((
+            ('trading_style', user_config['trading_style']),
+            ('asset_type', user_config['asset_type']),
+            ('confluence_threshold', user_config['confluence_threshold']),
+            ('max_daily_trades', user_config['max_trades'])
+        ))
         
         logger.info("   ✅ ICT strategy initialized")
         
@@ -270,8 +266,10 @@ def simulate_web_workflow():
         
         # Summary metrics
         current_price = analysis['current_price']
-        price_change = current_price - data['close'].iloc[-2] if len(data) > 1 else 0
-        price_change_pct = (price_change / data['close'].iloc[-2]) * 100 if len(data) > 1 else 0
+        closes = data['close'].to_numpy()
+        prev_close = closes[-2] if len(closes) > 1 else None
+        price_change = current_price - prev_close if prev_close is not None else 0
+        price_change_pct = (price_change / prev_close) * 100 if prev_close is not None else 0
         
         summary = {
             'current_price': f"{current_price:.5f}",
@@ -280,7 +278,7 @@ def simulate_web_workflow():
             'risk_level': trading_plan.get('risk_assessment', {}).get('overall_risk', 'medium').upper()
         }
         
-        logger.info(f"   Summary metrics: {summary}")
+        logger.info("   Summary metrics: %s", summary)
         
         # Analysis sections
         po3_analysis = analysis.get('po3_analysis', {})
@@ -289,27 +287,27 @@ def simulate_web_workflow():
             zone = price_position.get('zone', 'unknown').upper()
             strength = price_position.get('strength', 0)
             
-            logger.info(f"   PO3: {zone} zone (strength: {strength:.2f})")
+            logger.info("   PO3: %s zone (strength: %.2f)", zone, strength)
         
         # Trading signals
         if signals:
-            logger.info(f"   Trading Signals:")
+            logger.info("   Trading Signals:")
             for i, signal in enumerate(signals, 1):
-                logger.info(f"     {i}. {signal.get('type')} - {signal.get('direction').upper()}")
-                logger.info(f"        Confluence: {signal.get('confluence_score', 0):.2f}")
+                logger.info("     %s. %s - %s", i, signal.get('type'), signal.get('direction').upper())
+                logger.info("        Confluence: %.2f", signal.get('confluence_score', 0))
         
         # Recommendations
         recommendations = trading_plan.get('recommendations', [])
         if recommendations:
-            logger.info(f"   Recommendations:")
+            logger.info("   Recommendations:")
             for i, rec in enumerate(recommendations, 1):
-                logger.info(f"     {i}. {rec}")
+                logger.info("     %s. %s", i, rec)
         
         logger.info("✅ Complete web workflow simulation successful!")
         return True
         
     except Exception as e:
-        logger.error(f"❌ Web workflow simulation failed: {e}")
+        logger.error("❌ Web workflow simulation failed: %s", e)
         return False
 
 def main():
@@ -327,7 +325,7 @@ def main():
     results = {}
     
     for test_name, test_func in tests:
-        logger.info(f"\n🧪 Running: {test_name}")
+        logger.info("\n🧪 Running: %s", test_name)
         logger.info("-" * 40)
         
         try:
@@ -339,12 +337,12 @@ def main():
             results[test_name] = result
             
             if result:
-                logger.info(f"✅ {test_name}: PASSED")
+                logger.info("✅ %s: PASSED", test_name)
             else:
-                logger.info(f"❌ {test_name}: FAILED")
+                logger.info("❌ %s: FAILED", test_name)
                 
         except Exception as e:
-            logger.error(f"❌ {test_name}: ERROR - {e}")
+            logger.error("❌ %s: ERROR - %s", test_name, e)
             results[test_name] = False
     
     # Summary
@@ -357,10 +355,10 @@ def main():
     
     for test_name, result in results.items():
         status = "✅ PASSED" if result else "❌ FAILED"
-        logger.info(f"{test_name:30} : {status}")
+        logger.info("%-30s : %s", test_name, status)
     
     logger.info("-" * 60)
-    logger.info(f"OVERALL: {passed}/{total} tests passed ({passed/total*100:.1f}%)")
+    logger.info("OVERALL: %s/%s tests passed (%.1f%%)", passed, total, passed/total*100)
     
     if passed == total:
         logger.info("\n🎉 All web integration tests passed!")
@@ -376,5 +374,6 @@ def main():
     return passed == total
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     success = main()
     exit(0 if success else 1)
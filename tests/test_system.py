@@ -51,17 +51,17 @@ def test_data_fetching():
     try:
         from trading_core.data_manager import DataManager
 
-        dm = DataManager()
+        with DataManager() as dm:
+            # Test futures data
+            es_data = dm.get_futures_data('ES', period='5d', interval='1d')
+            # Test forex data
+            eurusd_data = dm.get_forex_data('EURUSD', period='5d', interval='1d')
 
-        # Test futures data
-        es_data = dm.get_futures_data('ES', period='5d', interval='1d')
         if not es_data.empty:
             print(f"✓ ES futures data: {len(es_data)} records")
         else:
             print("⚠ ES futures data is empty")
 
-        # Test forex data
-        eurusd_data = dm.get_forex_data('EURUSD', period='5d', interval='1d')
         if not eurusd_data.empty:
             print(f"✓ EURUSD forex data: {len(eurusd_data)} records")
         else:
@@ -82,11 +82,11 @@ def test_technical_indicators():
         from trading_core.data_manager import DataManager
         from trading_core.technical_indicators import TechnicalIndicators
 
-        dm = DataManager()
         ti = TechnicalIndicators()
 
         # Get sample data
-        data = dm.get_futures_data('ES', period='30d', interval='1d')
+        with DataManager() as dm:
+            data = dm.get_futures_data('ES', period='30d', interval='1d')
 
         if data.empty:
             print("⚠ No data available for indicator testing")
@@ -149,20 +149,20 @@ def test_strategy():
         from trading_core.strategy_framework import CustomStrategy
 
         # Initialize components
-        dm = DataManager()
         rm = RiskManager(100000)
         strategy = CustomStrategy(rm)
 
         # Get sample data
         sample_data = {}
-        for symbol in ['ES', 'EURUSD']:
-            if symbol == 'ES':
-                data = dm.get_futures_data(symbol, period='60d', interval='1d')
-            else:
-                data = dm.get_forex_data(symbol, period='60d', interval='1d')
-
-            if not data.empty:
-                sample_data[symbol] = data
+        with DataManager() as dm:
+            for symbol in ['ES', 'EURUSD']:
+                if symbol == 'ES':
+                    data = dm.get_futures_data(symbol, period='60d', interval='1d')
+                else:
+                    data = dm.get_forex_data(symbol, period='60d', interval='1d')
+
+                if not data.empty:
+                    sample_data[symbol] = data
 
         if not sample_data:
             print("⚠ No data available for strategy testing")
@@ -5,14 +5,34 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 import logging
+import os
+import hashlib
+from functools import reduce
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import seaborn as sns
 from trading_core.strategy_framework import BaseStrategy
+from trading_core.technical_indicators import TechnicalIndicators
 from trading_core.risk_manager import RiskManager
 from trading_core.data_manager import DataManager
 from config.config import trading_config
 
+# Optional Parquet engine for the on-disk indicator cache
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Bump the version whenever the indicator pipeline changes so old files are ignored
+INDICATOR_CACHE_DIR = os.path.join('.cache', 'indicators')
+INDICATOR_CACHE_VERSION = 1
+# Only the most recently used files are kept so the cache cannot grow without bound
+INDICATOR_CACHE_MAX_FILES = 64
+
+# One row of the backtest equity history
+EQUITY_DTYPE = [('equity', 'f8'), ('cash', 'f8'), ('unrealized_pnl', 'f8'), ('positions', 'i4')]
+
 class BacktestEngine:
     """Comprehensive backtesting engine"""
     
@@ -29,11 +49,11 @@ class BacktestEngine:
         self.logger.info(f"Starting backtest for {strategy.name}")
         
         # Initialize components
-        data_manager = DataManager()
         risk_manager = RiskManager(self.initial_capital)
         
         # Get historical data
-        all_data = self._get_backtest_data(data_manager, start_date, end_date, timeframe)
+        with DataManager() as data_manager:
+            all_data = self._get_backtest_data(data_manager, start_date, end_date, timeframe)
         
         if not all_data:
             self.logger.error("No data available for backtesting")
@@ -89,25 +109,39 @@ class BacktestEngine:
     def _simulate_trading(self, strategy: BaseStrategy, risk_manager: RiskManager, 
                          all_data: Dict[str, pd.DataFrame], timeframe: str) -> Dict:
         """Simulate trading with the strategy"""
-        # Get all unique timestamps
-        all_timestamps = set()
-        for df in all_data.values():
-            all_timestamps.update(df.index)
-        
-        timestamps = sorted(all_timestamps)
-        
-        equity_history = []
+        # Get all unique timestamps as one sorted index
+        indexes = [df.index for df in all_data.values()]
+        timestamps = reduce(lambda left, right: left.union(right), indexes) if indexes else pd.DatetimeIndex([])
+        
+        # Indicators are computed once over the full history; they only look
+        # backwards, so each bar's slice matches a recomputation on that slice.
+        # The exception is MACD, which add_macd leaves empty on short frames
+        prepared_data = self._mask_macd_warmup(self._prepare_data(strategy, all_data))
+        
+        # Row positions and close arrays per symbol so the loop indexes by offset
+        row_index = {symbol: {ts: pos for pos, ts in enumerate(df.index)}
+                     for symbol, df in prepared_data.items()}
+        closes = {symbol: df['close'].to_numpy() for symbol, df in prepared_data.items()}
+        
+        # Bars where the strategy can signal, so quiet bars skip signal generation
+        signal_masks = {symbol: strategy.signal_mask(df) for symbol, df in prepared_data.items()}
+        
+        # Equity history is preallocated as one typed row per bar; bars with no
+        # eligible symbol are skipped, so only the recorded rows are kept
+        equity_history = np.zeros(len(timestamps), dtype=EQUITY_DTYPE)
+        recorded = np.zeros(len(timestamps), dtype=bool)
         trade_log = []
         
         for i, timestamp in enumerate(timestamps):
             # Get current data slice (up to current timestamp)
             current_data = {}
-            for symbol, df in all_data.items():
-                if timestamp in df.index:
-                    # Get data up to current timestamp
-                    current_slice = df.loc[:timestamp]
-                    if len(current_slice) >= 20:  # Minimum data for indicators
-                        current_data[symbol] = current_slice
+            current_pos = {}
+            for symbol, df in prepared_data.items():
+                pos = row_index[symbol].get(timestamp)
+                if pos is not None and pos + 1 >= 20:  # Minimum data for indicators
+                    # Positional slice of rows up to the current timestamp
+                    current_data[symbol] = df.iloc[:pos + 1]
+                    current_pos[symbol] = pos
             
             if not current_data:
                 continue
@@ -115,7 +149,7 @@ class BacktestEngine:
             # Update existing positions with current prices
             for symbol in list(risk_manager.positions.keys()):
                 if symbol in current_data:
-                    current_price = current_data[symbol].iloc[-1]['close']
+                    current_price = closes[symbol][current_pos[symbol]]
                     risk_manager.update_position_pnl(symbol, current_price)
                     
                     # Check stop loss and take profit
@@ -127,8 +161,10 @@ class BacktestEngine:
                         trade = risk_manager.close_position(symbol, current_price, 'TAKE_PROFIT')
                         trade_log.append(trade)
             
-            # Generate new signals
-            signals = strategy.execute_strategy(current_data)
+            # Generate new signals only for symbols that can signal on this bar
+            candidates = {symbol: df for symbol, df in current_data.items()
+                          if signal_masks[symbol] is None or signal_masks[symbol][current_pos[symbol]]}
+            signals = strategy.execute_prepared(candidates) if candidates else []
             
             # Process signals
             for signal in signals:
@@ -156,56 +192,135 @@ class BacktestEngine:
             
             # Record equity
             portfolio_summary = risk_manager.get_portfolio_summary()
-            equity_history.append({
-                'timestamp': timestamp,
-                'equity': portfolio_summary['total_equity'],
-                'cash': portfolio_summary['current_capital'],
-                'unrealized_pnl': portfolio_summary['unrealized_pnl'],
-                'positions': portfolio_summary['positions_count']
-            })
+            equity_history[i] = (portfolio_summary['total_equity'],
+                                 portfolio_summary['current_capital'],
+                                 portfolio_summary['unrealized_pnl'],
+                                 portfolio_summary['positions_count'])
+            recorded[i] = True
         
         return {
-            'equity_history': equity_history,
+            'equity_history': pd.DataFrame(equity_history[recorded],
+                                           index=pd.Index(timestamps[recorded], name='timestamp')),
             'trade_log': trade_log,
             'final_portfolio': risk_manager.get_portfolio_summary(),
             'performance_metrics': risk_manager.get_performance_metrics()
         }
     
+    def _prepare_data(self, strategy: BaseStrategy, all_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Indicator frames per symbol, reusing Parquet copies from earlier runs on identical data"""
+        if not PARQUET_AVAILABLE:
+            return strategy.prepare_data(all_data)
+        
+        prepared_data = {}
+        for symbol, df in all_data.items():
+            cache_path = self._indicator_cache_path(strategy, df)
+            
+            if os.path.exists(cache_path):
+                try:
+                    prepared_data[symbol] = pd.read_parquet(cache_path)
+                    os.utime(cache_path)
+                    continue
+                except Exception as e:
+                    self.logger.warning(f"Ignoring unreadable indicator cache for {symbol}: {e}")
+            
+            prepared = strategy.prepare_data({symbol: df})
+            if symbol not in prepared:
+                continue
+            
+            prepared_data[symbol] = prepared[symbol]
+            try:
+                os.makedirs(INDICATOR_CACHE_DIR, exist_ok=True)
+                prepared[symbol].to_parquet(cache_path)
+                self._evict_indicator_cache()
+            except Exception as e:
+                self.logger.warning(f"Could not cache indicators for {symbol}: {e}")
+        
+        return prepared_data
+    
+    def _evict_indicator_cache(self):
+        """Delete the least recently used cache files beyond INDICATOR_CACHE_MAX_FILES"""
+        with os.scandir(INDICATOR_CACHE_DIR) as entries:
+            files = [entry for entry in entries if entry.is_file() and entry.name.endswith('.parquet')]
+        
+        files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in files[INDICATOR_CACHE_MAX_FILES:]:
+            try:
+                os.remove(entry.path)
+            except OSError as e:
+                self.logger.warning(f"Could not evict indicator cache file {entry.name}: {e}")
+    
+    def _mask_macd_warmup(self, prepared_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Blank MACD on bars a per-bar recomputation would have seen fewer than MACD_MIN_BARS rows for
+        
+        On the full history MACD is defined from bar 25 and its signal line from
+        bar 33, but add_macd returns NaN columns for any frame shorter than
+        TechnicalIndicators.MACD_MIN_BARS. Masking those leading bars keeps
+        signals identical to recomputing indicators on each bar's window.
+        """
+        warmup = TechnicalIndicators.MACD_MIN_BARS - 1
+        masked_data = {}
+        for symbol, df in prepared_data.items():
+            values = [column for column in ('macd', 'macd_signal', 'macd_histogram') if column in df.columns]
+            flags = [column for column in ('macd_bullish', 'macd_bearish') if column in df.columns]
+            if values or flags:
+                df = df.copy()
+                df.iloc[:warmup, df.columns.get_indexer(values)] = np.nan
+                df.iloc[:warmup, df.columns.get_indexer(flags)] = False
+            masked_data[symbol] = df
+        
+        return masked_data
+    
+    def _indicator_cache_path(self, strategy: BaseStrategy, df: pd.DataFrame) -> str:
+        """Cache file named by a hash of the raw data and the strategy class"""
+        digest = hashlib.sha1()
+        digest.update(f"{INDICATOR_CACHE_VERSION}:{type(strategy).__module__}.{type(strategy).__qualname__}".encode())
+        digest.update(f"{list(df.columns)}:{df.index.dtype}".encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return os.path.join(INDICATOR_CACHE_DIR, f"{digest.hexdigest()}.parquet")
+    
     def _calculate_performance_metrics(self, results: Dict, risk_manager: RiskManager) -> Dict:
         """Calculate comprehensive performance metrics"""
-        equity_df = pd.DataFrame(results['equity_history'])
+        equity_df = results['equity_history']
         
         if equity_df.empty:
             return {}
         
-        equity_df.set_index('timestamp', inplace=True)
+        equity = equity_df['equity'].to_numpy(dtype=float)
         
         # Basic metrics
-        total_return = (equity_df['equity'].iloc[-1] - self.initial_capital) / self.initial_capital
+        total_return = (equity[-1] - self.initial_capital) / self.initial_capital
         
         # Calculate daily returns
-        equity_df['daily_return'] = equity_df['equity'].pct_change()
+        returns = np.diff(equity) / equity[:-1]
+        equity_df['daily_return'] = np.concatenate(([np.nan], returns))
         
-        # Risk metrics
-        volatility = equity_df['daily_return'].std() * np.sqrt(252)  # Annualized
-        sharpe_ratio = (equity_df['daily_return'].mean() * 252) / (equity_df['daily_return'].std() * np.sqrt(252))
+        # Risk metrics (sample std, matching pandas)
+        if len(returns) > 1:
+            mean_return = returns.mean()
+            return_std = returns.std(ddof=1)
+        else:
+            mean_return = return_std = np.nan
+        volatility = return_std * np.sqrt(252)  # Annualized
+        sharpe_ratio = mean_return / return_std * np.sqrt(252)
         
         # Drawdown calculation
-        equity_df['peak'] = equity_df['equity'].expanding().max()
-        equity_df['drawdown'] = (equity_df['equity'] - equity_df['peak']) / equity_df['peak']
-        max_drawdown = equity_df['drawdown'].min()
+        peak = np.maximum.accumulate(equity)
+        drawdown = (equity - peak) / peak
+        equity_df['peak'] = peak
+        equity_df['drawdown'] = drawdown
+        max_drawdown = drawdown.min()
         
         # Trade-based metrics
         trade_metrics = risk_manager.get_performance_metrics()
         
         performance = {
             'total_return_pct': total_return * 100,
-            'total_return_usd': equity_df['equity'].iloc[-1] - self.initial_capital,
+            'total_return_usd': equity[-1] - self.initial_capital,
             'volatility_pct': volatility * 100,
             'sharpe_ratio': sharpe_ratio,
             'max_drawdown_pct': max_drawdown * 100,
             'calmar_ratio': (total_return * 100) / abs(max_drawdown * 100) if max_drawdown != 0 else 0,
-            'final_equity': equity_df['equity'].iloc[-1],
+            'final_equity': equity[-1],
             'equity_curve': equity_df,
             **trade_metrics
         }
@@ -7,64 +7,127 @@ import numpy as np
 from datetime import datetime, timedelta
 import sqlite3
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Optional
 from config.config import trading_config, instrument_config
 
+# Map our futures symbols to yfinance tickers
+FUTURES_TICKERS = {
+    'ES': 'ES=F',  # E-mini S&P 500
+    'NQ': 'NQ=F',  # E-mini Nasdaq
+    'YM': 'YM=F'   # E-mini Dow
+}
+
+# Price table definition, shared by init_database and the keyless-table migration
+# price_data timestamps are UTC text in one format so keys and range filters compare as strings
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIMESTAMP_GLOB = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+
+PRICE_DATA_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        symbol TEXT,
+        timestamp DATETIME,
+        timeframe TEXT,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume INTEGER,
+        PRIMARY KEY (symbol, timestamp, timeframe)
+    )
+'''
+
 class DataManager:
     """Handles data fetching, storage, and retrieval"""
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.db_path = trading_config.DATABASE_PATH
+
+        # One connection for the lifetime of the manager, shared across threads
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._db_lock = threading.Lock()
+
         self.init_database()
 
+    def close(self):
+        """Close the shared database connection"""
+        with self._db_lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def init_database(self):
         """Initialize SQLite database for storing market data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Create tables for price data
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS price_data (
-                symbol TEXT,
-                timestamp DATETIME,
-                timeframe TEXT,
-                open REAL,
-                high REAL,
-                low REAL,
-                close REAL,
-                volume INTEGER,
-                PRIMARY KEY (symbol, timestamp, timeframe)
-            )
-        ''')
-
-        # Create table for strategy signals
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS signals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT,
-                timestamp DATETIME,
-                signal_type TEXT,
-                price REAL,
-                confidence REAL,
-                strategy_name TEXT
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+        with self._db_lock, self._conn:
+            cursor = self._conn.cursor()
+
+            # Write-ahead logging lets readers run alongside upserts
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+            # Create tables for price data
+            cursor.execute(PRICE_DATA_SCHEMA.format(table='price_data'))
+
+            # Older to_sql(if_exists='replace') writes rebuilt the table without its key
+            self._migrate_price_data(cursor)
+
+            # Create table for strategy signals
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS signals (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT,
+                    timestamp DATETIME,
+                    signal_type TEXT,
+                    price REAL,
+                    confidence REAL,
+                    strategy_name TEXT
+                )
+            ''')
+
+    def _migrate_price_data(self, cursor: sqlite3.Cursor):
+        """Rebuild price_data with its primary key and canonical timestamps, keeping the latest row per key"""
+        columns = cursor.execute("PRAGMA table_info(price_data)").fetchall()
+        keyed = any(column[5] for column in columns)
+        stale = cursor.execute(
+            "SELECT 1 FROM price_data WHERE timestamp NOT GLOB ? LIMIT 1", (TIMESTAMP_GLOB,)
+        ).fetchone()
+        if keyed and not stale:
+            return
+
+        self.logger.info("Rebuilding price_data with its (symbol, timestamp, timeframe) key")
+        rows = cursor.execute(
+            "SELECT symbol, timestamp, timeframe, open, high, low, close, volume "
+            "FROM price_data ORDER BY rowid"
+        ).fetchall()
+        timestamps = self._timestamp_keys([row[1] for row in rows]) if rows else []
+
+        cursor.execute("DROP TABLE IF EXISTS price_data_migrated")
+        cursor.execute(PRICE_DATA_SCHEMA.format(table='price_data_migrated'))
+        cursor.executemany(
+            "INSERT OR REPLACE INTO price_data_migrated "
+            "(symbol, timestamp, timeframe, open, high, low, close, volume) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(row[0], timestamp, *row[2:]) for row, timestamp in zip(rows, timestamps)]
+        )
+        cursor.execute("DROP TABLE price_data")
+        cursor.execute("ALTER TABLE price_data_migrated RENAME TO price_data")
+
+    def _timestamp_keys(self, timestamps) -> List[str]:
+        """Timestamps as UTC text in TIMESTAMP_FORMAT; naive values are taken as UTC"""
+        return pd.to_datetime(timestamps, utc=True, format='ISO8601').strftime(TIMESTAMP_FORMAT).tolist()
 
     def get_futures_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """Fetch futures data using yfinance"""
         try:
             # Map our symbols to yfinance tickers
-            ticker_map = {
-                'ES': 'ES=F',  # E-mini S&P 500
-                'NQ': 'NQ=F',  # E-mini Nasdaq
-                'YM': 'YM=F'   # E-mini Dow
-            }
-
-            ticker = ticker_map.get(symbol, symbol)
+            ticker = FUTURES_TICKERS.get(symbol, symbol)
             data = yf.download(ticker, period=period, interval=interval, progress=False)
 
             if data.empty:
@@ -72,14 +135,7 @@ class DataManager:
                 return pd.DataFrame()
 
             # Clean and standardize data
-            data = data.dropna()
-
-            # Handle multi-level columns from yfinance
-            if isinstance(data.columns, pd.MultiIndex):
-                data.columns = data.columns.droplevel(1)
-
-            # Convert column names to lowercase
-            data.columns = [col.lower() if isinstance(col, str) else str(col).lower() for col in data.columns]
+            data = self._clean_price_data(data)
 
             # Store in database
             self._store_price_data(symbol, data, interval)
@@ -102,14 +158,7 @@ class DataManager:
                 return pd.DataFrame()
 
             # Clean and standardize data
-            data = data.dropna()
-
-            # Handle multi-level columns from yfinance
-            if isinstance(data.columns, pd.MultiIndex):
-                data.columns = data.columns.droplevel(1)
-
-            # Convert column names to lowercase
-            data.columns = [col.lower() if isinstance(col, str) else str(col).lower() for col in data.columns]
+            data = self._clean_price_data(data)
 
             # Store in database
             self._store_price_data(symbol, data, interval)
@@ -122,40 +171,83 @@ class DataManager:
 
     def get_all_instruments_data(self, period: str = "1y", interval: str = "1d") -> Dict[str, pd.DataFrame]:
         """Fetch data for all configured instruments"""
+        symbols = trading_config.FUTURES_SYMBOLS + trading_config.FOREX_SYMBOLS
+        tickers = {symbol: FUTURES_TICKERS.get(symbol, symbol) if symbol in trading_config.FUTURES_SYMBOLS
+                   else f"{symbol}=X" for symbol in symbols}
+
+        # One batched download for every instrument
+        try:
+            self.logger.info(f"Fetching data for {', '.join(symbols)}")
+            bulk = yf.download(list(tickers.values()), period=period, interval=interval,
+                               group_by='ticker', threads=True, progress=False)
+        except Exception as e:
+            self.logger.error(f"Batched download failed, fetching instruments one by one: {e}")
+
+            # Downloads are network-bound, so run them side by side
+            with ThreadPoolExecutor(max_workers=min(8, len(symbols) or 1)) as pool:
+                frames = pool.map(lambda symbol: self._fetch_instrument(symbol, period, interval), symbols)
+                return dict(zip(symbols, frames))
+
+        downloaded = set(bulk.columns.get_level_values(0)) if isinstance(bulk.columns, pd.MultiIndex) else set()
+
         all_data = {}
+        for symbol, ticker in tickers.items():
+            data = self._clean_price_data(bulk[ticker]) if ticker in downloaded else pd.DataFrame()
 
-        # Fetch futures data
-        for symbol in trading_config.FUTURES_SYMBOLS:
-            self.logger.info(f"Fetching futures data for {symbol}")
-            all_data[symbol] = self.get_futures_data(symbol, period, interval)
+            if data.empty:
+                self.logger.warning(f"No data retrieved for {symbol}")
+                all_data[symbol] = pd.DataFrame()
+                continue
 
-        # Fetch forex data
-        for symbol in trading_config.FOREX_SYMBOLS:
-            self.logger.info(f"Fetching forex data for {symbol}")
-            all_data[symbol] = self.get_forex_data(symbol, period, interval)
+            # Store in database
+            self._store_price_data(symbol, data, interval)
+            all_data[symbol] = data
 
         return all_data
 
-    def _store_price_data(self, symbol: str, data: pd.DataFrame, timeframe: str):
-        """Store price data in database"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+    def _fetch_instrument(self, symbol: str, period: str, interval: str) -> pd.DataFrame:
+        """Fetch one configured instrument with the matching futures or forex loader"""
+        if symbol in trading_config.FUTURES_SYMBOLS:
+            self.logger.info(f"Fetching futures data for {symbol}")
+            return self.get_futures_data(symbol, period, interval)
+
+        self.logger.info(f"Fetching forex data for {symbol}")
+        return self.get_forex_data(symbol, period, interval)
+
+    def _clean_price_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Drop incomplete rows and flatten yfinance columns to lowercase names"""
+        data = data.dropna()
 
-            # Prepare data for insertion
-            data_to_store = data.copy()
-            data_to_store['symbol'] = symbol
-            data_to_store['timeframe'] = timeframe
-            data_to_store['timestamp'] = data_to_store.index
+        # Handle multi-level columns from yfinance
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.droplevel(1)
 
-            # Select relevant columns
-            columns = ['symbol', 'timestamp', 'timeframe', 'open', 'high', 'low', 'close', 'volume']
-            data_to_store = data_to_store[columns]
+        # Convert column names to lowercase
+        data.columns = data.columns.astype(str).str.lower()
 
-            # Insert or replace data
-            data_to_store.to_sql('price_data', conn, if_exists='replace', index=False)
+        return data
 
-            conn.close()
-            self.logger.info(f"Stored {len(data_to_store)} records for {symbol}")
+    def _store_price_data(self, symbol: str, data: pd.DataFrame, timeframe: str):
+        """Store price data in database"""
+        try:
+            # Prepare rows as plain Python values for parameter binding
+            rows = list(zip(
+                repeat(symbol),
+                self._timestamp_keys(data.index),
+                repeat(timeframe),
+                *(data[col].tolist() for col in ['open', 'high', 'low', 'close', 'volume'])
+            ))
+
+            # Upsert on the (symbol, timestamp, timeframe) key in one transaction
+            with self._db_lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO price_data "
+                    "(symbol, timestamp, timeframe, open, high, low, close, volume) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+            self.logger.info(f"Stored {len(rows)} records for {symbol}")
 
         except Exception as e:
             self.logger.error(f"Error storing data for {symbol}: {e}")
@@ -163,8 +255,6 @@ class DataManager:
     def get_stored_data(self, symbol: str, timeframe: str, start_date: Optional[str] = None) -> pd.DataFrame:
         """Retrieve stored data from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-
             query = "SELECT * FROM price_data WHERE symbol = ? AND timeframe = ?"
             params = [symbol, timeframe]
 
@@ -174,11 +264,11 @@ class DataManager:
 
             query += " ORDER BY timestamp"
 
-            data = pd.read_sql_query(query, conn, params=params)
-            conn.close()
+            with self._db_lock:
+                data = pd.read_sql_query(query, self._conn, params=params)
 
             if not data.empty:
-                data['timestamp'] = pd.to_datetime(data['timestamp'])
+                data['timestamp'] = pd.to_datetime(data['timestamp'], format=TIMESTAMP_FORMAT, utc=True)
                 data.set_index('timestamp', inplace=True)
 
             return data
@@ -445,8 +445,10 @@ def create_advanced_chart(data, symbol):
 
 
     # Volume with better colors
-    colors = ['#00ff88' if data['Close'].iloc[i] >= data['Open'].iloc[i] else '#ff4444'
-              for i in range(len(data))]
+    # Compare whole columns once instead of two .iloc lookups per bar
+    closes = data['Close'].to_numpy()
+    opens = data['Open'].to_numpy()
+    colors = np.where(closes >= opens, '#00ff88', '#ff4444')
 
     fig.add_trace(go.Bar(
         x=data.index, y=data['Volume'],
@@ -1,7 +1,6 @@
 """
 Market Data API Integration for Symbol Lookup and Real-time Data
 """
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import requests
@@ -10,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 @dataclass
@@ -48,6 +48,9 @@ class MarketDataAPI:
             'User-Agent': 'AlgoTrading/1.0'
         })
         
+        # Quote requests are network-bound, so they are fanned out over a small thread pool
+        self.quote_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='quotes')
+        
         # Symbol mappings for different asset classes
         self.futures_mapping = {
             'ES': 'ES=F',    # E-mini S&P 500
@@ -119,6 +122,7 @@ class MarketDataAPI:
             # Map futures and forex symbols
             yf_symbol = self._map_symbol(symbol)
             
+            import yfinance as yf
             ticker = yf.Ticker(yf_symbol)
             info = ticker.info
             
@@ -195,6 +199,7 @@ class MarketDataAPI:
         """Get market data for a symbol"""
         try:
             yf_symbol = self._map_symbol(symbol)
+            import yfinance as yf
             ticker = yf.Ticker(yf_symbol)
             
             # Get historical data
@@ -204,7 +209,7 @@ class MarketDataAPI:
                 return None
             
             # Clean and standardize data
-            data.columns = [col.lower() for col in data.columns]
+            data.columns = data.columns.str.lower()
             data = data.dropna()
             
             return data
@@ -217,6 +222,7 @@ class MarketDataAPI:
         """Get real-time quote for a symbol"""
         try:
             yf_symbol = self._map_symbol(symbol)
+            import yfinance as yf
             ticker = yf.Ticker(yf_symbol)
             
             # Get latest data
@@ -256,8 +262,10 @@ class MarketDataAPI:
         """Get real-time quotes for multiple symbols"""
         quotes = {}
         
-        for symbol in symbols:
-            quote = self.get_real_time_quote(symbol)
+        # Fetch concurrently; map() keeps results in the order of symbols
+        results = self.quote_pool.map(self.get_real_time_quote, symbols)
+        
+        for symbol, quote in zip(symbols, results):
             if quote:
                 quotes[symbol] = quote
             else:
@@ -306,6 +314,7 @@ class MarketDataAPI:
         """Get fundamental data for a symbol"""
         try:
             yf_symbol = self._map_symbol(symbol)
+            import yfinance as yf
             ticker = yf.Ticker(yf_symbol)
             info = ticker.info
             
@@ -355,6 +364,7 @@ class MarketDataAPI:
         """Get options chain for a symbol"""
         try:
             yf_symbol = self._map_symbol(symbol)
+            import yfinance as yf
             ticker = yf.Ticker(yf_symbol)
             
             # Get available expiration dates
@@ -6,8 +6,58 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
+from functools import lru_cache
 from config.config import trading_config, instrument_config
 
+@lru_cache(maxsize=1024)
+def _position_size(symbol: str, entry_price: float, stop_loss: float,
+                   account_balance: float, risk_per_trade: float) -> int:
+    """Position size math, memoized on its scalar inputs"""
+    # Risk amount per trade
+    risk_amount = account_balance * risk_per_trade
+    
+    # Price difference (risk per unit)
+    price_diff = abs(entry_price - stop_loss)
+    
+    # Determine if futures or forex
+    if symbol in trading_config.FUTURES_SYMBOLS:
+        # Futures position sizing
+        specs = instrument_config.FUTURES_SPECS[symbol]
+        tick_value = specs['tick_value']
+        tick_size = specs['tick_size']
+        
+        # Calculate ticks at risk
+        ticks_at_risk = price_diff / tick_size
+        risk_per_contract = ticks_at_risk * tick_value
+        
+        # Position size (number of contracts)
+        position_size = int(risk_amount / risk_per_contract)
+        
+        # Check margin requirements
+        margin_required = position_size * specs['margin_requirement']
+        if margin_required > account_balance * 0.3:  # Max 30% of capital for margin
+            position_size = int((account_balance * 0.3) / specs['margin_requirement'])
+            
+    else:
+        # Forex position sizing
+        specs = instrument_config.FOREX_SPECS[symbol]
+        pip_value = specs['pip_value']
+        
+        # Assume standard lot size (100,000 units)
+        standard_lot = 100000
+        
+        # Calculate pips at risk
+        pips_at_risk = price_diff / pip_value
+        
+        # Risk per standard lot
+        risk_per_lot = pips_at_risk * 10  # $10 per pip for standard lot
+        
+        # Position size (in lots)
+        lots = risk_amount / risk_per_lot
+        position_size = int(lots * standard_lot)  # Convert to units
+    
+    return position_size
+
 class RiskManager:
     """Comprehensive risk management system"""
     
@@ -24,52 +74,12 @@ class RiskManager:
                               account_balance: float) -> int:
         """Calculate position size based on risk per trade"""
         try:
-            # Risk amount per trade
-            risk_amount = account_balance * trading_config.RISK_PER_TRADE
-            
-            # Price difference (risk per unit)
-            price_diff = abs(entry_price - stop_loss)
-            
-            if price_diff == 0:
+            if entry_price == stop_loss:
                 self.logger.warning(f"Zero price difference for {symbol}, cannot calculate position size")
                 return 0
             
-            # Determine if futures or forex
-            if symbol in trading_config.FUTURES_SYMBOLS:
-                # Futures position sizing
-                specs = instrument_config.FUTURES_SPECS[symbol]
-                tick_value = specs['tick_value']
-                tick_size = specs['tick_size']
-                
-                # Calculate ticks at risk
-                ticks_at_risk = price_diff / tick_size
-                risk_per_contract = ticks_at_risk * tick_value
-                
-                # Position size (number of contracts)
-                position_size = int(risk_amount / risk_per_contract)
-                
-                # Check margin requirements
-                margin_required = position_size * specs['margin_requirement']
-                if margin_required > account_balance * 0.3:  # Max 30% of capital for margin
-                    position_size = int((account_balance * 0.3) / specs['margin_requirement'])
-                    
-            else:
-                # Forex position sizing
-                specs = instrument_config.FOREX_SPECS[symbol]
-                pip_value = specs['pip_value']
-                
-                # Assume standard lot size (100,000 units)
-                standard_lot = 100000
-                
-                # Calculate pips at risk
-                pips_at_risk = price_diff / pip_value
-                
-                # Risk per standard lot
-                risk_per_lot = pips_at_risk * 10  # $10 per pip for standard lot
-                
-                # Position size (in lots)
-                lots = risk_amount / risk_per_lot
-                position_size = int(lots * standard_lot)  # Convert to units
+            position_size = _position_size(symbol, entry_price, stop_loss, account_balance,
+                                           trading_config.RISK_PER_TRADE)
             
             self.logger.info(f"Calculated position size for {symbol}: {position_size}")
             return max(0, position_size)
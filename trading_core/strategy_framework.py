@@ -32,6 +32,10 @@ class BaseStrategy(ABC):
         """Calculate entry price, stop loss, and take profit"""
         pass
 
+    def signal_mask(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Boolean array of bars where generate_signals can fire; None means check every bar"""
+        return None
+
     def prepare_data(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
         """Prepare data with technical indicators"""
         prepared_data = {}
@@ -74,6 +78,10 @@ class BaseStrategy(ABC):
         # Prepare data with indicators
         prepared_data = self.prepare_data(data)
 
+        return self.execute_prepared(prepared_data)
+
+    def execute_prepared(self, prepared_data: Dict[str, pd.DataFrame]) -> List[Dict]:
+        """Generate and validate signals from data that already carries indicators"""
         # Generate signals
         signals = self.generate_signals(prepared_data)
 
@@ -160,6 +168,30 @@ class CustomStrategy(BaseStrategy):
 
         return signals
 
+    def signal_mask(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Vectorized form of the generate_signals conditions; tests/test_strategy_framework.py checks they agree"""
+        trending = data['market_regime'].isin(['TRENDING', 'STRONG_TREND'])
+
+        long_conditions = np.column_stack([
+            data['rsi'] < self.rsi_oversold,
+            data['macd'] > data['macd_signal'],
+            data['close'] < data['bb_lower'],
+            data['ema_20'] > data['sma_50'],
+            trending
+        ])
+        short_conditions = np.column_stack([
+            data['rsi'] > self.rsi_overbought,
+            data['macd'] < data['macd_signal'],
+            data['close'] > data['bb_upper'],
+            data['ema_20'] < data['sma_50'],
+            trending
+        ])
+
+        mask = ((long_conditions.mean(axis=1) >= self.min_confidence) |
+                (short_conditions.mean(axis=1) >= self.min_confidence))
+        mask[:49] = False  # generate_signals skips slices shorter than 50 bars
+        return mask
+
     def calculate_entry_exit(self, symbol: str, data: pd.DataFrame, signal: Dict) -> Tuple[float, float, Optional[float]]:
         """Calculate entry, stop loss, and take profit levels - CUSTOMIZE THIS"""
         latest = data.iloc[-1]
@@ -198,14 +230,14 @@ class MomentumStrategy(BaseStrategy):
 
             # Momentum conditions
             momentum_up = (
-                latest['ema_20'] > latest['ema_20'] and
+                latest['ema_20'] > latest['ema_50'] and
                 latest['rsi'] > 50 and
                 latest['macd'] > 0 and
                 latest['close'] > latest['sma_20']
             )
 
             momentum_down = (
-                latest['ema_20'] < latest['ema_20'] and
+                latest['ema_20'] < latest['ema_50'] and
                 latest['rsi'] < 50 and
                 latest['macd'] < 0 and
                 latest['close'] < latest['sma_20']
@@ -232,6 +264,26 @@ class MomentumStrategy(BaseStrategy):
 
         return signals
 
+    def signal_mask(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Vectorized form of the momentum conditions"""
+        momentum_up = (
+            (data['ema_20'] > data['ema_50']) &
+            (data['rsi'] > 50) &
+            (data['macd'] > 0) &
+            (data['close'] > data['sma_20'])
+        )
+
+        momentum_down = (
+            (data['ema_20'] < data['ema_50']) &
+            (data['rsi'] < 50) &
+            (data['macd'] < 0) &
+            (data['close'] < data['sma_20'])
+        )
+
+        mask = (momentum_up | momentum_down).to_numpy(copy=True)
+        mask[:19] = False
+        return mask
+
     def calculate_entry_exit(self, symbol: str, data: pd.DataFrame, signal: Dict) -> Tuple[float, float, Optional[float]]:
         """Calculate entry/exit for momentum strategy"""
         latest = data.iloc[-1]
@@ -297,6 +349,24 @@ class MeanReversionStrategy(BaseStrategy):
 
         return signals
 
+    def signal_mask(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Vectorized form of the mean reversion conditions"""
+        oversold = (
+            (data['rsi'] < 30) &
+            (data['bb_position'] < 0.1) &
+            (data['close'] < data['sma_20'] * 0.98)
+        )
+
+        overbought = (
+            (data['rsi'] > 70) &
+            (data['bb_position'] > 0.9) &
+            (data['close'] > data['sma_20'] * 1.02)
+        )
+
+        mask = (oversold | overbought).to_numpy(copy=True)
+        mask[:19] = False
+        return mask
+
     def calculate_entry_exit(self, symbol: str, data: pd.DataFrame, signal: Dict) -> Tuple[float, float, Optional[float]]:
         """Calculate entry/exit for mean reversion strategy"""
         latest = data.iloc[-1]
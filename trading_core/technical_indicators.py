@@ -10,6 +10,9 @@ import logging
 class TechnicalIndicators:
     """Collection of technical indicators for strategy development"""
 
+    # add_macd leaves MACD columns empty on frames shorter than this
+    MACD_MIN_BARS = 34
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
@@ -108,8 +111,8 @@ class TechnicalIndicators:
         """Add MACD indicator"""
         try:
             # Check if we have enough data for MACD (needs at least 34 periods)
-            if len(df) < 34:
-                self.logger.warning(f"Insufficient data for MACD calculation: {len(df)} rows (need 34+)")
+            if len(df) < self.MACD_MIN_BARS:
+                self.logger.warning(f"Insufficient data for MACD calculation: {len(df)} rows (need {self.MACD_MIN_BARS}+)")
                 df['macd'] = np.nan
                 df['macd_signal'] = np.nan
                 df['macd_histogram'] = np.nan